@@ -0,0 +1,114 @@
+"""
+Profile Visual Studio file generation (tybuild.vs_templates).
+
+Generates a solution with 200 projects and a project from a template with
+500 sources, under cProfile, in a temporary directory. Prints the hottest
+functions and how much of the time was spent in ElementTree and in string
+building, to check where generation time goes before optimizing it.
+
+Usage (from the repository root):
+    python scripts/profile_vs_templates.py [--top N]
+"""
+
+import argparse
+import cProfile
+import pstats
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tybuild.vs_templates import (  # noqa: E402
+    generate_project_from_template,
+    generate_project_guid,
+    generate_solution,
+)
+
+TEMPLATE_NAME = "ZZZZZZZZ_profile"
+SOLUTION_PROJECTS = 200
+TEMPLATE_SOURCES = 500
+RUNS = 20
+
+
+def write_template(directory: Path) -> None:
+    """Write a vcxproj/filters template pair listing TEMPLATE_SOURCES sources."""
+    items = "\n".join(
+        f'    <ClCompile Include="D:\\x\\src\\file{i}.cpp" />' for i in range(TEMPLATE_SOURCES))
+    filter_items = "\n".join(
+        f'    <ClCompile Include="D:\\x\\src\\file{i}.cpp">\n'
+        f'      <Filter>Source Files</Filter>\n'
+        f'    </ClCompile>' for i in range(TEMPLATE_SOURCES))
+    (directory / f"{TEMPLATE_NAME}.vcxproj").write_text(f"""<?xml version="1.0" encoding="utf-8"?>
+<Project DefaultTargets="Build" ToolsVersion="17.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <PropertyGroup Label="Globals">
+    <ProjectGuid>{{11111111-2222-3333-4444-555555555555}}</ProjectGuid>
+    <ProjectName>{TEMPLATE_NAME}</ProjectName>
+  </PropertyGroup>
+  <ItemGroup>
+    <CustomBuild Include="D:\\x\\CMakeLists.txt" />
+  </ItemGroup>
+  <ItemGroup>
+{items}
+  </ItemGroup>
+</Project>
+""", encoding="utf-8")
+    (directory / f"{TEMPLATE_NAME}.vcxproj.filters").write_text(f"""<?xml version="1.0" encoding="utf-8"?>
+<Project ToolsVersion="17.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <ItemGroup>
+{filter_items}
+  </ItemGroup>
+  <ItemGroup>
+    <Filter Include="Source Files">
+      <UniqueIdentifier>{{AAAAAAAA-1111-2222-3333-444444444444}}</UniqueIdentifier>
+    </Filter>
+  </ItemGroup>
+</Project>
+""", encoding="utf-8")
+
+
+def workload(directory: Path) -> None:
+    projects = [(f"Project{i}", generate_project_guid("console", f"Project{i}"))
+                for i in range(SOLUTION_PROJECTS)]
+    sources = [f"module{i // 50}/file{i}.cpp" for i in range(TEMPLATE_SOURCES)]
+    out = directory / "build"
+    out.mkdir(exist_ok=True)
+    for run in range(RUNS):
+        generate_solution(out / "Solution.sln", "SOLUTION-GUID", "ALL-BUILD-GUID",
+                          "ZERO-CHECK-GUID", "ONE-CHECK-GUID", projects, force=True)
+        generate_project_from_template(directory, TEMPLATE_NAME, f"Project{run}",
+                                       projects[run][1], directory / "src", sources, out,
+                                       force=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=25, help="Number of functions to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_template(directory)
+        profiler = cProfile.Profile()
+        profiler.runcall(workload, directory)
+
+    stats = pstats.Stats(profiler)
+    stats.sort_stats("tottime").print_stats(args.top)
+
+    # Self time by where it was spent
+    total = 0.0
+    etree = 0.0
+    strings = 0.0
+    for (filename, _line, name), (_cc, _nc, tottime, _ct, _callers) in stats.stats.items():
+        total += tottime
+        if "xml" in filename or "ElementTree" in name or "_elementtree" in name:
+            etree += tottime
+        elif filename == "~" and ("str" in name or "join" in name or "format" in name):
+            strings += tottime
+    if total:
+        print(f"ElementTree:     {etree / total:6.1%} of self time")
+        print(f"String building: {strings / total:6.1%} of self time")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,15 @@ from discovered projects and templates.
 
 from __future__ import annotations
 
+import errno
+import functools
+import hashlib
 import json
-import shutil
+import os
 import sys
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     from importlib.resources import files
@@ -20,11 +23,11 @@ except ImportError:
     # Python < 3.9
     from importlib_resources import files
 
-from tybuild.dependencies import get_cpp_dependencies
+from tybuild.dependencies import get_cpp_dependencies, posix_relpath
 from tybuild.projects import discover_projects, Project
 from tybuild.vs_templates import (
-    generate_project_from_template,
     generate_project_guid,
+    generate_projects_from_template,
     generate_solution,
     get_project_guid,
 )
@@ -32,53 +35,344 @@ from tybuild.vs_templates import (
 CACHE_FILENAME = ".tybuild"
 EXCLUDED_PROJECT_TYPES = {"wasm"}
 
+# Reusable buffer for copying template files
+_COPY_BUF = bytearray(256 * 1024)
+_COPY_MV = memoryview(_COPY_BUF)
+
+# Largest request handed to the kernel per copy_file_range/sendfile call
+_KERNEL_COPY_CHUNK = 2 ** 30
+
+# Errors meaning the kernel copy path is unavailable for this pair of files
+_KERNEL_COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP,
+}
+
 
 def _is_vs_project(project: Project) -> bool:
     """Return True if project should be generated as a VS project."""
     return project.type not in EXCLUDED_PROJECT_TYPES
 
 
-def _get_file_identity(path: Path) -> Dict[str, int]:
-    """Get file identity (size and mtime) for cache comparison."""
-    st = path.stat()
+@functools.lru_cache(maxsize=None)
+def _get_builtin_template(name: str) -> bytes:
+    """Read a template shipped with the package (cached; resources are immutable)."""
+    return files("tybuild").joinpath("templates").joinpath(name).read_bytes()
+
+
+def _quiet(*args: Any, **kwargs: Any) -> None:
+    """Logger used when progress output is disabled."""
+
+
+StatCache = Dict[Path, Optional[os.stat_result]]
+# Content hashes computed in this run, so a file shared by many projects (the
+# ZZZZZZZZ_<type> templates) is read and hashed at most once
+HashCache = Dict[Path, str]
+
+
+def _cached_stat(path: Path, stat_cache: Optional[StatCache] = None) -> Optional[os.stat_result]:
+    """Stat a file, reusing results from stat_cache. Returns None if it doesn't exist."""
+    if stat_cache is not None and path in stat_cache:
+        return stat_cache[path]
+    try:
+        st: Optional[os.stat_result] = path.stat()
+    except FileNotFoundError:
+        st = None
+    if stat_cache is not None:
+        stat_cache[path] = st
+    return st
+
+
+def _scan_dir_stats(directory: Path) -> StatCache:
+    """
+    Stat every file in a directory with one os.scandir pass.
+
+    On Windows the stat data comes straight from the directory listing, so
+    this replaces one metadata call per file with a single enumeration.
+    """
+    stats: StatCache = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file():
+                stats[directory / entry.name] = entry.stat()
+    return stats
+
+
+def _fast_identity(path: Path, stat_cache: Optional[StatCache] = None) -> Dict[str, int]:
+    """Get cheap file identity (size and mtime) for cache comparison."""
+    st = _cached_stat(path, stat_cache)
+    if st is None:
+        raise FileNotFoundError(f"File not found: {path}")
     return {
         "size": st.st_size,
         "mtime_ns": st.st_mtime_ns,
     }
 
 
-def _file_changed(path: Path, cached_identity: Dict[str, int]) -> bool:
-    """Check if file has changed compared to cached identity."""
-    if not path.exists():
+def _content_hash(path: Path, hash_cache: Optional[HashCache] = None) -> str:
+    """Hash file contents, for when mtime alone is not trustworthy."""
+    if hash_cache is not None:
+        digest = hash_cache.get(path)
+        if digest is not None:
+            return digest
+    digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    if hash_cache is not None:
+        hash_cache[path] = digest
+    return digest
+
+
+def _get_file_identity(
+    path: Path,
+    cached_identity: Optional[Dict[str, Any]] = None,
+    stat_cache: Optional[StatCache] = None,
+    hash_cache: Optional[HashCache] = None
+) -> Dict[str, Any]:
+    """
+    Get file identity (size, mtime and content hash) for cache comparison.
+
+    The hash is carried over from cached_identity when size and mtime still
+    match, so unchanged files are not read.
+    """
+    identity: Dict[str, Any] = _fast_identity(path, stat_cache)
+    if (cached_identity and cached_identity.get("hash")
+            and cached_identity.get("size") == identity["size"]
+            and cached_identity.get("mtime_ns") == identity["mtime_ns"]):
+        identity["hash"] = cached_identity["hash"]
+    else:
+        identity["hash"] = _content_hash(path, hash_cache)
+    return identity
+
+
+def _file_changed(
+    path: Path,
+    cached_identity: Dict[str, Any],
+    stat_cache: Optional[StatCache] = None,
+    hash_cache: Optional[HashCache] = None
+) -> bool:
+    """
+    Check if file has changed compared to cached identity.
+
+    Size and mtime are compared first. If only the mtime differs (e.g. after
+    a git checkout), the contents are hashed; when the hash still matches,
+    the cached mtime is updated in place so later checks stay on the fast path.
+    """
+    if _cached_stat(path, stat_cache) is None:
+        return True
+    current = _fast_identity(path, stat_cache)
+    if current["size"] != cached_identity.get("size"):
         return True
-    current = _get_file_identity(path)
-    return (current["size"] != cached_identity.get("size") or
-            current["mtime_ns"] != cached_identity.get("mtime_ns"))
+    if current["mtime_ns"] == cached_identity.get("mtime_ns"):
+        return False
+    cached_hash = cached_identity.get("hash")
+    if cached_hash is None or _content_hash(path, hash_cache) != cached_hash:
+        return True
+    cached_identity["mtime_ns"] = current["mtime_ns"]
+    return False
+
+
+def _aggregate_identity(items: Iterable[str]) -> str:
+    """
+    Hash a collection of strings into one order-independent digest.
+
+    Lets a whole set (e.g. a project's source list) be compared against the
+    cache with a single string comparison.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for item in sorted(items):
+        h.update(item.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _generator_fingerprint() -> bytes:
+    """
+    Identify this tybuild: its installed version and built-in templates.
+
+    Part of the tree hash, so upgrading tybuild regenerates the build files.
+    """
+    try:
+        from importlib.metadata import version
+        package_version = version("tybuild")
+    except Exception:
+        # Python < 3.8, or running from a source tree without metadata
+        package_version = ""
+    h = hashlib.blake2b(package_version.encode("utf-8"), digest_size=16)
+    for name in ("ONE_CHECK.vcxproj",):
+        h.update(_get_builtin_template(name))
+    return h.digest()
+
+
+def _tree_hash(roots: Iterable[Path], salt: bytes = b"") -> str:
+    """
+    Hash the path, size and mtime of every file and directory under the given roots.
+
+    Any addition, removal or modification below a root changes the result.
+    Symlinked directories are not followed, matching the dependency scanner.
+    salt is hashed first (e.g. _generator_fingerprint()).
+    """
+    h = hashlib.blake2b(salt, digest_size=16)
+    for root in roots:
+        stack = [str(root)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                    record = f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}\0"
+                except OSError:
+                    record = f"{entry.path}\0missing\0"
+                h.update(record.encode("utf-8", "surrogateescape"))
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return h.hexdigest()
+
+
+def _list_build_files(build_dir: Path) -> Set[str]:
+    """Names of the files in build_dir, from one directory listing instead of a stat per file."""
+    try:
+        with os.scandir(build_dir) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        return set()
+
+
+def _missing_project_output(
+    name: str,
+    project_type: str,
+    build_files: Set[str],
+    template_dir: Path,
+    stat_cache: Optional[StatCache] = None
+) -> Optional[str]:
+    """
+    Return the name of a generated file of a project that is not in build_files, or None.
+
+    A .vcxproj.filters is expected when the project type's template has one.
+    """
+    if f"{name}.vcxproj" not in build_files:
+        return f"{name}.vcxproj"
+    filters = f"{name}.vcxproj.filters"
+    if (filters not in build_files
+            and _cached_stat(template_dir / f"ZZZZZZZZ_{project_type}.vcxproj.filters",
+                             stat_cache) is not None):
+        return filters
+    return None
+
+
+def _outputs_present(
+    build_files: Set[str],
+    cache: Dict[str, Any],
+    template_dir: Path,
+    stat_cache: Optional[StatCache] = None
+) -> bool:
+    """Check that the solution and every cached project's files are still in the build directory."""
+    if "Solution.sln" not in build_files:
+        return False
+    return all(
+        _missing_project_output(p["name"], p["type"], build_files, template_dir, stat_cache) is None
+        for p in cache.get("projects", [])
+    )
+
+
+def _copy_file_range(fsrc: int, fdst: int) -> None:
+    """Copy the rest of fsrc to fdst with os.copy_file_range (may clone on CoW filesystems)."""
+    while os.copy_file_range(fsrc, fdst, _KERNEL_COPY_CHUNK):
+        pass
+
+
+def _copy_sendfile(fsrc: int, fdst: int) -> None:
+    """Copy the rest of fsrc to fdst with os.sendfile."""
+    offset = os.lseek(fsrc, 0, os.SEEK_CUR)
+    while True:
+        n = os.sendfile(fdst, fsrc, offset, _KERNEL_COPY_CHUNK)
+        if not n:
+            break
+        offset += n
+
+
+def _copy_buffered(fi, fo) -> None:
+    """Copy file contents between binary file objects using a shared buffer."""
+    while True:
+        n = fi.readinto(_COPY_BUF)
+        if not n:
+            break
+        fo.write(_COPY_MV[:n])
+
+
+def _fast_copy(src: Path, dst: Path, src_stat: os.stat_result) -> None:
+    """
+    Copy src to dst, letting the kernel move the bytes where possible.
+
+    Tries os.copy_file_range, then os.sendfile, then falls back to a buffered
+    read/write loop. The modification time from src_stat is applied to dst.
+    """
+    with src.open("rb") as fi, dst.open("wb") as fo:
+        fsrc, fdst = fi.fileno(), fo.fileno()
+        copied = False
+        for kernel_copy, available in (
+            (_copy_file_range, hasattr(os, "copy_file_range")),
+            (_copy_sendfile, hasattr(os, "sendfile")),
+        ):
+            if not available:
+                continue
+            try:
+                kernel_copy(fsrc, fdst)
+                copied = True
+                break
+            except OSError as e:
+                if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                    raise
+                # Start over from a clean destination
+                os.lseek(fsrc, 0, os.SEEK_SET)
+                os.lseek(fdst, 0, os.SEEK_SET)
+                os.ftruncate(fdst, 0)
+        if not copied:
+            _copy_buffered(fi, fo)
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
 
 
 def _load_build_cache(cache_path: Path) -> Dict[str, Any]:
     """Load build cache from .tybuild file."""
-    if not cache_path.exists():
-        return {}
     try:
-        with cache_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return json.loads(cache_path.read_bytes())
     except Exception:
         return {}
 
 
 def _save_build_cache(cache_path: Path, cache: Dict[str, Any]) -> None:
-    """Save build cache to .tybuild file."""
-    with cache_path.open("w", encoding="utf-8") as f:
-        json.dump(cache, f, indent=2, sort_keys=True)
+    """
+    Save build cache to .tybuild file.
+
+    The cache is written to a temporary file and then moved into place, so
+    an interrupted run never leaves a truncated cache behind.
+    """
+    data = json.dumps(cache, separators=(",", ":")).encode("utf-8")
+    tmp = cache_path.with_suffix(".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, cache_path)
+    except BaseException:
+        # Do not leave the partial or unplaced temporary file behind
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 
 def _copy_special_projects(
     template_dir: Path,
     build_dir: Path,
     cache: Dict[str, Any],
-    force: bool = False
-) -> Dict[str, Dict[str, int]]:
+    force: bool = False,
+    stat_cache: Optional[StatCache] = None,
+    log: Callable[..., None] = print
+) -> Dict[str, Dict[str, Any]]:
     """
     Copy ALL_BUILD and ZERO_CHECK project files from template to build directory,
     and ONE_CHECK from package templates. Only copies if files have changed.
@@ -88,9 +382,11 @@ def _copy_special_projects(
         build_dir: Target directory for build files
         cache: Build cache dictionary
         force: If True, copy all files regardless of cache
+        stat_cache: Optional stat results shared with the caller
+        log: Function used for progress messages (warnings always go to stderr)
 
     Returns:
-        Dictionary mapping filenames to their file identities (size, mtime_ns)
+        Dictionary mapping filenames to their file identities
     """
     special_projects_cache = cache.get("special_projects", {})
     new_identities = {}
@@ -107,40 +403,39 @@ def _copy_special_projects(
         src = template_dir / filename
         dst = build_dir / filename
 
-        if not src.exists():
+        src_stat = _cached_stat(src, stat_cache)
+        if src_stat is None:
             print(f"  Warning: Template file not found: {filename}", file=sys.stderr)
             continue
 
         # Check if we need to copy
         needs_copy = force
         reason = "--force flag"
+        cached_identity = special_projects_cache.get(filename, {})
 
         if not needs_copy:
-            cached_identity = special_projects_cache.get(filename, {})
-            if _file_changed(src, cached_identity):
+            if _file_changed(src, cached_identity, stat_cache):
                 needs_copy = True
                 reason = "file changed"
-            elif not dst.exists():
+            elif not os.path.exists(dst):
                 needs_copy = True
                 reason = "destination missing"
 
         if needs_copy:
-            shutil.copy2(src, dst)
-            print(f"  Copied: {filename} ({reason})")
+            _fast_copy(src, dst, src_stat)
+            log(f"  Copied: {filename} ({reason})")
         else:
-            print(f"  Up to date: {filename}")
+            log(f"  Up to date: {filename}")
 
         # Store identity
-        new_identities[filename] = _get_file_identity(src)
+        new_identities[filename] = _get_file_identity(src, cached_identity, stat_cache)
 
     # Copy built-in templates (ONE_CHECK) from package
     builtin_templates = ["ONE_CHECK.vcxproj"]
 
-    templates_path = files("tybuild").joinpath("templates")
     for filename in builtin_templates:
         try:
             dst = build_dir / filename
-            template_resource = templates_path.joinpath(filename)
 
             # For package resources, we need to check by content or always copy
             # Since we can't easily get mtime from package resources, we'll check
@@ -148,34 +443,26 @@ def _copy_special_projects(
             needs_copy = force
             reason = "--force flag"
 
-            if not needs_copy:
-                # Get the content to check size
-                template_content = template_resource.read_text(encoding="utf-8")
-                content_size = len(template_content.encode("utf-8"))
+            template_bytes = _get_builtin_template(filename)
+            content_size = len(template_bytes)
 
+            if not needs_copy:
                 cached_identity = special_projects_cache.get(filename, {})
                 if cached_identity.get("size") != content_size:
                     needs_copy = True
                     reason = "content size changed"
-                elif not dst.exists():
+                elif not os.path.exists(dst):
                     needs_copy = True
                     reason = "destination missing"
 
-                if needs_copy:
-                    dst.write_text(template_content, encoding="utf-8")
-                    print(f"  Copied: {filename} (built-in, {reason})")
-                else:
-                    print(f"  Up to date: {filename} (built-in)")
-
-                # Store identity (size only for package resources)
-                new_identities[filename] = {"size": content_size, "mtime_ns": 0}
+            if needs_copy:
+                dst.write_bytes(template_bytes)
+                log(f"  Copied: {filename} (built-in, {reason})")
             else:
-                # Force copy
-                template_content = template_resource.read_text(encoding="utf-8")
-                dst.write_text(template_content, encoding="utf-8")
-                print(f"  Copied: {filename} (built-in, {reason})")
-                content_size = len(template_content.encode("utf-8"))
-                new_identities[filename] = {"size": content_size, "mtime_ns": 0}
+                log(f"  Up to date: {filename} (built-in)")
+
+            # Store identity (size only for package resources)
+            new_identities[filename] = {"size": content_size, "mtime_ns": 0}
 
         except Exception as e:
             print(f"  Warning: Failed to copy built-in template {filename}: {e}", file=sys.stderr)
@@ -183,7 +470,138 @@ def _copy_special_projects(
     return new_identities
 
 
-def generate_build_files(base_path: Optional[Path] = None, force: bool = False) -> List[Project]:
+def _process_project(
+    project: Project,
+    base_path: Path,
+    src_root: Path,
+    template_dir: Path,
+    template_paths: Dict[str, Path],
+    build_dir: Path,
+    cached_by_name: Dict[str, Dict[str, Any]],
+    force: bool,
+    stat_cache: StatCache,
+    hash_cache: HashCache,
+    build_files: Set[str],
+    dep_cache: Dict[Any, Any]
+) -> Tuple[str, Dict[str, Any], List[str], Optional[Dict[str, Any]]]:
+    """
+    Resolve dependencies for one project and decide whether it must be regenerated.
+
+    Safe to run concurrently for different projects. Progress messages are
+    returned rather than printed so the caller can emit them in order.
+    Rendering is left to the caller (see generate_projects_from_template).
+
+    Returns:
+        Tuple of (project GUID, new cache entry, log lines, render job). The
+        render job holds the generate_project_from_template() arguments, or
+        is None if the project is up to date.
+    """
+    log = [f"Processing {project.type}/{project.name}..."]
+
+    # Generate deterministic GUID for this project
+    project_guid = generate_project_guid(project.type, project.name)
+
+    # Get dependencies for the main cpp file
+    cpp_deps = get_cpp_dependencies(
+        base_path, project.cpp_file, refresh=force, include_headers=False, cache=dep_cache
+    )
+
+    # Build sources list: main cpp + cpp dependencies
+    main_cpp_rel = posix_relpath(project.cpp_file, src_root)
+    sources = [main_cpp_rel] + cpp_deps
+
+    # Generate template name
+    template_name = f"ZZZZZZZZ_{project.type}"
+    template_vcxproj = template_paths[project.type]
+
+    # Check if project needs regeneration
+    cached_project = cached_by_name.get(project.name)
+
+    needs_regen = force
+    reason = "--force flag"
+
+    if not needs_regen and cached_project is None:
+        needs_regen = True
+        reason = "new project"
+    elif not needs_regen and cached_project.get("guid", project_guid) != project_guid:
+        needs_regen = True
+        reason = "GUID changed"
+    elif not needs_regen:
+        # Check template file (size and mtime)
+        template_identity = cached_project.get("template_identity", {})
+        if _file_changed(template_vcxproj, template_identity, stat_cache, hash_cache):
+            needs_regen = True
+            reason = "template changed"
+
+    if not needs_regen:
+        # Regenerate files deleted from the build directory
+        missing = _missing_project_output(
+            project.name, project.type, build_files, template_dir, stat_cache
+        )
+        if missing is not None:
+            needs_regen = True
+            reason = f"{missing} missing"
+
+    sources_hash = _aggregate_identity(sources)
+
+    if not needs_regen and cached_project:
+        # Check if set of source files changed
+        cached_hash = cached_project.get("sources_hash")
+        if cached_hash is not None:
+            sources_changed = cached_hash != sources_hash
+        else:
+            # Cache written before sources_hash was recorded
+            sources_changed = set(cached_project.get("sources", [])) != set(sources)
+        if sources_changed:
+            needs_regen = True
+            reason = "source file set changed"
+
+    render_job: Optional[Dict[str, Any]] = None
+    if needs_regen:
+        log.append(f"  Regenerating ({reason})")
+        log.append(f"  GUID: {project_guid}")
+        log.append(f"  Sources: {len(sources)} file(s)")
+
+        render_job = {
+            "template_path": template_dir,
+            "template_name": template_name,
+            "project_name": project.name,
+            "project_guid": project_guid,
+            "source_root": src_root,
+            "sources_rel_to_root": sources,
+            "output_path": build_dir,
+            "force": force,
+        }
+
+        log.append(f"  Generated: {build_dir / project.name}.vcxproj")
+    else:
+        log.append(f"  Up to date (skipping)")
+
+    # Cache entry for this project
+    cache_entry = {
+        "name": project.name,
+        "type": project.type,
+        "guid": project_guid,
+        "template_identity": _get_file_identity(
+            template_vcxproj,
+            cached_project.get("template_identity") if cached_project else None,
+            stat_cache,
+            hash_cache,
+        ),
+        "sources": sources,  # Just the list of source file paths
+        "sources_hash": sources_hash,
+    }
+
+    return project_guid, cache_entry, log, render_job
+
+
+def generate_build_files(
+    base_path: Optional[Path] = None,
+    force: bool = False,
+    verbose: bool = False,
+    projects: Optional[List[Project]] = None,
+    dep_cache: Optional[Dict[Any, Any]] = None
+) -> List[Project]:
     """
     Generate Visual Studio project and solution files for all discovered projects.
 
@@ -201,6 +619,11 @@ def generate_build_files(base_path: Optional[Path] = None, force: bool = False)
     Args:
         base_path: Base directory (defaults to current working directory)
         force: If True, regenerate all files regardless of cache
+        verbose: If True, report progress for every file and project;
+            otherwise only a summary is printed
+        projects: Already discovered projects (discovered here if None)
+        dep_cache: Dependency scan results to share with other callers of
+            get_cpp_dependencies() in the same invocation (see that function)
 
     Returns:
         List of projects that were processed
@@ -220,42 +643,66 @@ def generate_build_files(base_path: Optional[Path] = None, force: bool = False)
     build_dir = base_path / "build"
 
     # Validate required directories exist
-    if not src_root.exists():
+    if not os.path.isdir(src_root):
         raise RuntimeError(f"Source directory not found: {src_root}")
-    if not template_dir.exists():
+    if not os.path.isdir(template_dir):
         raise RuntimeError(f"Template directory not found: {template_dir}")
 
     # Create build directory
     build_dir.mkdir(exist_ok=True)
 
+    log = print if verbose else _quiet
+
     # Load build cache from build directory
     cache_path = build_dir / CACHE_FILENAME
     build_cache = {} if force else _load_build_cache(cache_path)
 
+    # Index cached projects by name for O(1) lookup
+    cached_by_name = {p["name"]: p for p in build_cache.get("projects", [])}
+
+    # Stat results for template files, shared by all cache checks in this run
+    stat_cache = _scan_dir_stats(template_dir)
+    hash_cache: HashCache = {}
+
     # Copy special CMake project files (only if changed)
-    print("Copying special project files...")
-    special_projects_identities = _copy_special_projects(template_dir, build_dir, build_cache, force)
-    print()
+    log("Copying special project files...")
+    special_projects_identities = _copy_special_projects(
+        template_dir, build_dir, build_cache, force, stat_cache, log
+    )
+    log()
+
+    # Nothing to do if no file under src/ or build_template/ changed since the last run
+    tree_hash = _tree_hash([src_root, template_dir], _generator_fingerprint())
+    build_files = _list_build_files(build_dir)
+    if (not force and build_cache.get("tree_hash") == tree_hash
+            and _outputs_present(build_files, build_cache, template_dir, stat_cache)):
+        if projects is None:
+            projects = discover_projects(base_path)
+        print("Build files up to date (no changes under src/ or build_template/)")
+        print(f"  {len(projects)} project(s)")
+        return projects
 
     # Discover projects
-    projects = discover_projects(base_path)
+    if projects is None:
+        projects = discover_projects(base_path)
     vs_projects = [project for project in projects if _is_vs_project(project)]
 
     if not projects:
         raise RuntimeError("No projects found in ./src/project/")
 
-    print(f"Found {len(projects)} project(s):")
-    for project in projects:
-        print(f"  {project.type:15} {project.name}")
-    print()
+    print(f"Found {len(projects)} project(s)")
+    if verbose:
+        sys.stdout.write("".join(f"  {p.type:15} {p.name}\n" for p in projects) + "\n")
 
     # Get or generate solution GUID
     solution_guid = build_cache.get("solution_guid")
     if not solution_guid:
-        solution_guid = str(uuid.uuid4()).upper()
-        print(f"Generated new solution GUID: {solution_guid}")
+        # Derived from the source root, so a cleaned build directory gets the
+        # same solution GUID back
+        solution_guid = generate_project_guid("solution", str(src_root))
+        log(f"Generated new solution GUID: {solution_guid}")
     else:
-        print(f"Using existing solution GUID: {solution_guid}")
+        log(f"Using existing solution GUID: {solution_guid}")
 
     # Extract GUIDs from copied project files
     all_build_path = build_dir / "ALL_BUILD.vcxproj"
@@ -283,116 +730,80 @@ def generate_build_files(base_path: Optional[Path] = None, force: bool = False)
             f"Ensure the file exists and contains a valid ProjectGuid element."
         )
 
-    print(f"ALL_BUILD GUID: {all_build_guid}")
-    print(f"ZERO_CHECK GUID: {zero_check_guid}")
-    print(f"ONE_CHECK GUID: {one_check_guid}")
-    print()
+    log(f"ALL_BUILD GUID: {all_build_guid}")
+    log(f"ZERO_CHECK GUID: {zero_check_guid}")
+    log(f"ONE_CHECK GUID: {one_check_guid}")
+    log()
 
     # Check if project set changed (for solution regeneration)
-    current_project_set = [(p.name, p.type) for p in vs_projects]
-    cached_project_set = [
-        (p["name"], p["type"])
-        for p in build_cache.get("projects", [])
+    # (GUIDs are included so a GUID change also refreshes the solution; caches
+    # written before GUIDs were recorded are assumed to match)
+    current_project_set = frozenset(
+        (p.name, p.type, generate_project_guid(p.type, p.name)) for p in vs_projects
+    )
+    cached_project_set = frozenset(
+        (p["name"], p["type"], p.get("guid") or generate_project_guid(p["type"], p["name"]))
+        for p in cached_by_name.values()
         if p.get("type") not in EXCLUDED_PROJECT_TYPES
-    ]
-    solution_needs_regen = force or current_project_set != cached_project_set
+    )
+    solution_needs_regen = (force or current_project_set != cached_project_set
+                            or "Solution.sln" not in build_files)
 
     if solution_needs_regen:
-        print("Solution needs regeneration (project set changed or --force)")
+        log("Solution needs regeneration (project set changed, solution missing or --force)")
     else:
-        print("Solution up to date (project set unchanged)")
-    print()
-
-    # Generate project files
-    projects_to_add = []
-    new_cache = {
-        "solution_guid": solution_guid,
-        "special_projects": special_projects_identities,
-        "projects": []
-    }
+        log("Solution up to date (project set unchanged)")
+    log()
 
+    # Resolve and check each project type's template path once, before any
+    # work is done; existence checks are answered from the template directory
+    # scan in stat_cache
+    template_paths: Dict[str, Path] = {}
     for project in vs_projects:
-
-        print(f"Processing {project.type}/{project.name}...")
-
-        # Generate deterministic GUID for this project
-        project_guid = generate_project_guid(project.type, project.name)
-
-        # Get dependencies for the main cpp file
-        cpp_deps = get_cpp_dependencies(base_path, project.cpp_file, include_headers=False)
-
-        # Build sources list: main cpp + cpp dependencies
-        main_cpp_rel = project.cpp_file.relative_to(src_root).as_posix()
-        sources = [main_cpp_rel] + cpp_deps
-
-        # Generate template name
-        template_name = f"ZZZZZZZZ_{project.type}"
-        template_vcxproj = template_dir / f"{template_name}.vcxproj"
-
-        if not template_vcxproj.exists():
+        if project.type in template_paths:
+            continue
+        template_vcxproj = template_dir / f"ZZZZZZZZ_{project.type}.vcxproj"
+        if _cached_stat(template_vcxproj, stat_cache) is None:
             raise FileNotFoundError(
                 f"Template not found: {template_vcxproj}\n"
                 f"Expected template for project type '{project.type}'"
             )
+        template_paths[project.type] = template_vcxproj
+
+    # Dependency scan results shared by all projects in this run
+    if dep_cache is None:
+        dep_cache = {}
+
+    # Dependency resolution and change detection are I/O-bound, so use threads
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Results come back in project order, keeping output and cache deterministic
+        results = list(executor.map(
+            lambda project: _process_project(
+                project, base_path, src_root, template_dir, template_paths, build_dir,
+                cached_by_name, force, stat_cache, hash_cache, build_files, dep_cache,
+            ),
+            vs_projects,
+        ))
+
+    # Build each list in one comprehension over the results
+    projects_to_add = [(project.name, result[0]) for project, result in zip(vs_projects, results)]
+    new_cache = {
+        "solution_guid": solution_guid,
+        "special_projects": special_projects_identities,
+        "tree_hash": tree_hash,
+        "projects": [result[1] for result in results],
+    }
+    project_logs = [result[2] for result in results]
+    render_jobs = [result[3] for result in results if result[3] is not None]
 
-        # Check if project needs regeneration
-        cached_project = None
-        for p in build_cache.get("projects", []):
-            if p["name"] == project.name:
-                cached_project = p
-                break
-
-        needs_regen = force
-        reason = "--force flag"
-
-        if not needs_regen and cached_project is None:
-            needs_regen = True
-            reason = "new project"
-        elif not needs_regen:
-            # Check template file (size and mtime)
-            template_identity = cached_project.get("template_identity", {})
-            if _file_changed(template_vcxproj, template_identity):
-                needs_regen = True
-                reason = "template changed"
-
-        if not needs_regen and cached_project:
-            # Check if set of source files changed
-            cached_sources = set(cached_project.get("sources", []))
-            current_sources = set(sources)
-            if current_sources != cached_sources:
-                needs_regen = True
-                reason = "source file set changed"
-
-        if needs_regen:
-            print(f"  Regenerating ({reason})")
-            print(f"  GUID: {project_guid}")
-            print(f"  Sources: {len(sources)} file(s)")
-
-            # Generate project files
-            generate_project_from_template(
-                template_path=template_dir,
-                template_name=template_name,
-                project_name=project.name,
-                project_guid=project_guid,
-                source_root=src_root,
-                sources_rel_to_root=sources,
-                output_path=build_dir,
-            )
-
-            print(f"  Generated: {build_dir / project.name}.vcxproj")
-        else:
-            print(f"  Up to date (skipping)")
-
-        # Update cache for this project
-        new_cache["projects"].append({
-            "name": project.name,
-            "type": project.type,
-            "template_identity": _get_file_identity(template_vcxproj),
-            "sources": sources,  # Just the list of source file paths
-        })
+    generate_projects_from_template(render_jobs)
+    regenerated_count = len(render_jobs)
 
-        projects_to_add.append((project.name, project_guid))
-        print()
+    if verbose:
+        # One write for all projects rather than a print per line
+        sys.stdout.write("".join("\n".join(lines) + "\n\n" for lines in project_logs))
+        sys.stdout.flush()
 
     # Generate solution (only if needed)
     sln_path = build_dir / "Solution.sln"
@@ -405,6 +816,7 @@ def generate_build_files(base_path: Optional[Path] = None, force: bool = False)
             zero_check_guid=zero_check_guid,
             one_check_guid=one_check_guid,
             projects_to_add=projects_to_add,
+            force=force,
         )
         print(f"Generated solution: {sln_path}")
     else:
@@ -414,7 +826,7 @@ def generate_build_files(base_path: Optional[Path] = None, force: bool = False)
     _save_build_cache(cache_path, new_cache)
     print()
     print(f"Build files generation complete!")
-    print(f"  {len(projects)} project(s)")
+    print(f"  {len(projects)} project(s), {regenerated_count} regenerated")
     print(f"  Cache saved: {cache_path}")
 
     return projects
@@ -1,17 +1,17 @@
 import argparse
 import sys
 from pathlib import Path
-from tybuild.dependencies import get_cpp_dependencies
-from tybuild.projects import discover_projects
-from tybuild.vs_templates import generate_project_guid, generate_solution, generate_project_from_template
-from tybuild.build import generate_build_files
-from tybuild.cmake_export import generate_cmake_file
+
+# tybuild modules are imported inside the command functions, so each command
+# (and --help) only pays for the modules it uses
 
 # from tybuild.clean import Clean
 
 
 def cmd_deps(args):
     """List .cpp file dependencies for a given source file."""
+    from tybuild.dependencies import get_cpp_dependencies
+
     try:
         repo_root = Path.cwd()
         start_file = Path(args.start).resolve()
@@ -39,6 +39,8 @@ def cmd_build(args):
 
 def cmd_list(args):
     """List all discovered projects."""
+    from tybuild.projects import discover_projects
+
     try:
         base_path = Path.cwd()
         projects = discover_projects(base_path)
@@ -59,9 +61,11 @@ def cmd_list(args):
 
 def cmd_generate(args):
     """Generate Visual Studio project and solution files."""
+    from tybuild.build import generate_build_files
+
     try:
         base_path = Path.cwd()
-        generate_build_files(base_path, force=args.force)
+        generate_build_files(base_path, force=args.force, verbose=args.verbose)
 
     except (RuntimeError, FileNotFoundError) as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -74,6 +78,9 @@ def cmd_generate(args):
 
 def cmd_test_prj(args):
     """Test project generation from template."""
+    from tybuild.dependencies import get_cpp_dependencies
+    from tybuild.vs_templates import generate_project_from_template
+
     try:
 
         # Paths relative to current working directory
@@ -107,11 +114,45 @@ def cmd_test_prj(args):
 
 def cmd_generate_cmake(args):
     """Generate CMake file with project information."""
+    from tybuild.cmake_export import generate_cmake_file
+
     try:
         repo_root = Path.cwd()
         output_path = repo_root / 'generated_projects.cmake'
 
-        generate_cmake_file(repo_root, output_path)
+        generate_cmake_file(repo_root, output_path, refresh=args.refresh)
+
+        print(f"Generated {output_path}")
+
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Unexpected error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(2)
+
+
+def cmd_all(args):
+    """Generate Visual Studio build files and the CMake file in one pass."""
+    from tybuild.build import generate_build_files
+    from tybuild.cmake_export import generate_cmake_file
+    from tybuild.projects import discover_projects
+
+    try:
+        # Resolved, so the shared project paths match both generators' roots
+        repo_root = Path.cwd().resolve()
+        output_path = repo_root / 'generated_projects.cmake'
+
+        # Discovery and dependency scanning are shared by both generators
+        projects = discover_projects(repo_root)
+        dep_cache = {}
+
+        generate_build_files(repo_root, force=args.force, verbose=args.verbose,
+                             projects=projects, dep_cache=dep_cache)
+        generate_cmake_file(repo_root, output_path, refresh=args.force,
+                            projects=projects, dep_cache=dep_cache)
 
         print(f"Generated {output_path}")
 
@@ -153,6 +194,8 @@ def main():
     parser_generate = subparsers.add_parser('generate', help='Generate Visual Studio project and solution files')
     parser_generate.add_argument('--force', action='store_true',
                                 help='Force regeneration of all files, ignoring cache')
+    parser_generate.add_argument('-v', '--verbose', action='store_true',
+                                help='Report progress for every file and project')
     parser_generate.set_defaults(func=cmd_generate)
 
     # Test project generation command
@@ -161,8 +204,18 @@ def main():
 
     # Generate CMake command
     parser_generate_cmake = subparsers.add_parser('generate-cmake', help='Generate CMake file with project information')
+    parser_generate_cmake.add_argument('--refresh', action='store_true',
+                                      help='Rebuild dependency cache from scratch')
     parser_generate_cmake.set_defaults(func=cmd_generate_cmake)
 
+    # All command
+    parser_all = subparsers.add_parser('all', help='Generate Visual Studio build files and CMake file')
+    parser_all.add_argument('--force', action='store_true',
+                           help='Force regeneration of all files, ignoring cache')
+    parser_all.add_argument('-v', '--verbose', action='store_true',
+                           help='Report progress for every file and project')
+    parser_all.set_defaults(func=cmd_all)
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -170,3 +223,7 @@ def main():
         sys.exit(1)
 
     args.func(args)
+
+
+if __name__ == "__main__":
+    main()
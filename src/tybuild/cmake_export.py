@@ -6,20 +6,31 @@ Exports discovered projects and their dependencies to a CMake-friendly format.
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from tybuild.dependencies import get_cpp_dependencies
+from tybuild.dependencies import get_cpp_dependencies, posix_relpath, warmup_dep_cache
 from tybuild.projects import Project, discover_projects
 
 
-def generate_cmake_file(repo_root: Path, output_path: Path) -> None:
+def generate_cmake_file(
+    repo_root: Path,
+    output_path: Path,
+    refresh: bool = False,
+    projects: Optional[List[Project]] = None,
+    dep_cache: Optional[Dict[Any, Any]] = None
+) -> None:
     """
     Generate a CMake file listing all projects and their sources.
 
     Args:
         repo_root: Repository root directory (contains ./src)
         output_path: Path to write generated_projects.cmake file
+        refresh: If True, rebuild the dependency cache from scratch
+        projects: Already discovered projects (discovered here if None)
+        dep_cache: Dependency scan results to share with other callers of
+            get_cpp_dependencies() in the same invocation (see that function)
 
     The generated file contains:
     - GENERATED_PROJECTS variable with semicolon-separated project names
@@ -31,45 +42,56 @@ def generate_cmake_file(repo_root: Path, output_path: Path) -> None:
     src_root = repo_root / "src"
 
     # Discover all projects
-    projects = discover_projects(repo_root)
+    if projects is None:
+        projects = discover_projects(repo_root)
 
     if not projects:
         raise RuntimeError(f"No projects found under {repo_root / 'src' / 'project'}")
 
+    # Dependency scan results shared by all projects
+    if dep_cache is None:
+        dep_cache = {}
+
+    # Resolve every project's dependencies concurrently up front
+    warmup_dep_cache(repo_root, [p.cpp_file for p in projects], dep_cache, refresh=refresh)
+
     # Build CMake content
-    lines: List[str] = []
+    out = io.StringIO()
+    write = out.write
 
     # Generate project list
     project_names = [p.name for p in projects]
-    lines.append(f'set(GENERATED_PROJECTS "{";".join(project_names)}")')
-    lines.append("")
+    write(f'set(GENERATED_PROJECTS "{";".join(project_names)}")\n\n')
 
     # Generate settings for each project
     for project in projects:
         # Get dependencies (all .cpp files this project needs)
         try:
-            deps = get_cpp_dependencies(repo_root, project.cpp_file, include_headers=False)
+            deps = get_cpp_dependencies(
+                repo_root, project.cpp_file, include_headers=False,
+                refresh=refresh, cache=dep_cache
+            )
 
             # Build source list: start with the project's main .cpp file, then dependencies
             # Both main file and deps are relative to src_root
-            sources = [project.cpp_file.relative_to(src_root).as_posix()]
+            sources = [posix_relpath(project.cpp_file, src_root)]
             sources.extend(deps)
 
         except Exception as e:
             print(f"Warning: Could not get dependencies for {project.name}: {e}")
             # Fallback to just the main file
-            sources = [project.cpp_file.relative_to(src_root).as_posix()]
+            sources = [posix_relpath(project.cpp_file, src_root)]
 
         # Write project type
-        lines.append(f'set({project.name}_TYPE "{project.type}")')
+        write(f'set({project.name}_TYPE "{project.type}")\n')
 
         # Write project sources
-        lines.append(f'set({project.name}_SOURCES')
+        write(f'set({project.name}_SOURCES\n')
         for src in sources:
-            lines.append(f'    {src}')
-        lines.append(')')
-        lines.append('')
+            write(f'    {src}\n')
+        write(')\n')
+        write('\n')
 
-    # Write to file
-    content = '\n'.join(lines)
+    # Write to file, dropping the blank line after the last project
+    content = out.getvalue()[:-1]
     output_path.write_text(content, encoding='utf-8')
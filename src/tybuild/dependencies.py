@@ -8,18 +8,38 @@ dependency graphs including implicit header->source relationships.
 from __future__ import annotations
 
 import json
+import multiprocessing
 import os
 import re
 import sys
-from collections import deque
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # Optional; the standard json module is used without it
+    orjson = None
 
 INCLUDE_RE = re.compile(r'^#include\s+"([^"]+)"')  # must be at line start
+# INCLUDE_RE applied to a whole file: same matches, but never across lines
+_INCLUDE_FILE_RE = re.compile(r'^#include[^\S\n]+"([^"\n]+)"', re.MULTILINE)
 SCAN_EXTS = {".cpp", ".h"}
 CACHE_FILENAME = "includes.cache"
 
+# Serializes scans, which rewrite the shared cache file, and access to
+# scan results shared between threads through a per-invocation cache
+_SCAN_LOCK = threading.RLock()
+
+# Below this many files to parse, worker process startup costs more than
+# parsing them in this process
+_PROCESS_POOL_MIN_FILES = 256
+
 
 @dataclass(frozen=True)
 class FileIdentity:
@@ -27,12 +47,33 @@ class FileIdentity:
     mtime_ns: int
 
 
-CacheEntry = Dict[str, object]   # {"size": int, "mtime_ns": int, "includes": List[str]}
+class DepResult(NamedTuple):
+    """Dependencies of one start file, as sorted paths relative to ./src."""
+    cpp_files: Tuple[str, ...]
+    header_files: Tuple[str, ...]
+    all_files: Tuple[str, ...]
+
+
+# {"size": int, "mtime_ns": int, "includes": List[str] (include order),
+#  "missing": List[str] (optional; include candidates that did not exist)}
+CacheEntry = Dict[str, object]
 Cache = Dict[str, CacheEntry]    # keys are POSIX-style paths relative to root
 
 
 def posix_relpath(path: Path, root: Path) -> str:
-    """Convert a path to POSIX-style relative path from root."""
+    """
+    Convert a path to POSIX-style relative path from root.
+
+    Raises ValueError if path is not under root.
+    """
+    # Fast path: plain string prefix slicing instead of Path arithmetic
+    path_str = str(path)
+    root_str = str(root)
+    prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    if path_str.startswith(prefix):
+        rel = path_str[len(prefix):]
+        return rel.replace(os.sep, "/") if os.sep != "/" else rel
+    # Anything else (e.g. case differences on Windows) goes the slow way
     return path.relative_to(root).as_posix()
 
 
@@ -40,8 +81,11 @@ def load_cache(cache_path: Path) -> Cache:
     """Load cached scan results from disk."""
     if cache_path.is_file():
         try:
-            with cache_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            if orjson is not None:
+                data = orjson.loads(cache_path.read_bytes())
+            else:
+                with cache_path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
             if isinstance(data, dict):
                 return data  # type: ignore[return-value]
         except Exception:
@@ -50,23 +94,57 @@ def load_cache(cache_path: Path) -> Cache:
 
 
 def save_cache(cache_path: Path, cache: Cache) -> None:
-    """Save scan results to cache file."""
+    """Save scan results to cache file (compact JSON, keys in scan order)."""
     tmp = cache_path.with_suffix(".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(cache, f, indent=2, sort_keys=True)
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(cache))
+    else:
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, separators=(",", ":"), ensure_ascii=False)
     tmp.replace(cache_path)
 
 
-def find_source_files(root: Path) -> List[Path]:
-    """Find all .cpp and .h files under root directory."""
-    files: List[Path] = []
-    for dirpath, _dirnames, filenames in os.walk(root):
-        d = Path(dirpath)
-        for name in filenames:
-            p = d / name
-            if p.suffix in SCAN_EXTS:
-                files.append(p)
-    return files
+def find_source_files(root: Path) -> List[Tuple[Path, FileIdentity]]:
+    """
+    Find all .cpp and .h files under root directory, with their identities.
+
+    Walks in the same order as os.walk (files of a directory, then its
+    subdirectories; directory symlinks are not followed), but stats each file
+    through its os.scandir entry rather than with a separate path lookup.
+    Files that vanish or cannot be stat'ed during the walk are skipped.
+    """
+    return [(Path(path), ident) for path, ident, _is_link in _walk_source_files(root)]
+
+
+def _walk_source_files(root: Path) -> Iterator[Tuple[str, FileIdentity, bool]]:
+    """
+    find_source_files() with string paths, also telling which files are symlinks.
+
+    Files are yielded as each directory is read, so callers can start on them
+    before the whole tree has been walked.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        subdirs: List[str] = []
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                    if os.path.splitext(entry.name)[1] not in SCAN_EXTS:
+                        continue
+                    st = entry.stat()
+                    is_link = entry.is_symlink()
+                except OSError:
+                    continue
+                yield entry.path, FileIdentity(size=st.st_size, mtime_ns=st.st_mtime_ns), is_link
+        stack.extend(reversed(subdirs))
 
 
 def current_identity(p: Path) -> FileIdentity:
@@ -80,28 +158,64 @@ def needs_rescan(entry: CacheEntry, ident: FileIdentity) -> bool:
     return entry.get("size") != ident.size or entry.get("mtime_ns") != ident.mtime_ns
 
 
-def parse_includes(file_path: Path) -> List[str]:
+def parse_includes(file_path: str | Path) -> List[str]:
     """Parse #include "..." statements from a file."""
     includes: List[str] = []
     try:
-        with file_path.open("r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                m = INCLUDE_RE.match(line)
-                if m:
-                    inc = m.group(1).strip()
-                    if inc:
-                        includes.append(inc)
+        with open(file_path, "rb") as f:
+            data = f.read()
     except Exception:
-        pass
+        return includes
+
+    # Most files that include nothing are rejected here at C speed, without
+    # decoding them or entering the regex engine. Only pure ASCII files are
+    # rejected: elsewhere, dropped undecodable bytes could still join up
+    # into "#include".
+    if b"#include" not in data and data.isascii():
+        return includes
+
+    # One regex pass over the whole file instead of a match per line; newlines
+    # are normalized as text-mode reading would
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    for m in _INCLUDE_FILE_RE.finditer(text):
+        inc = m.group(1).strip()
+        if inc:
+            includes.append(inc)
     return includes
 
 
+@lru_cache(maxsize=4096)
+def _parse_includes_cached(file_path: str, size: int, mtime_ns: int) -> Tuple[str, ...]:
+    """
+    parse_includes() memoized for the life of the process.
+
+    size and mtime_ns are only part of the key: a file that changes gets a
+    new identity, so its stale entry is never hit again.
+    """
+    return tuple(parse_includes(file_path))
+
+
 def resolve_include(root: Path, includer: Path, include_str: str) -> Path | None:
     """
     Resolve an include path, checking:
     1. Relative to the includer file
     2. Relative to the source root (if not found in step 1)
     """
+    resolved = _resolve_include(root, includer, include_str)
+    if resolved is None:
+        print(_unresolved_warning(root, includer, include_str), file=sys.stderr)
+    return resolved
+
+
+def _unresolved_warning(root: Path, includer: Path, include_str: str) -> str:
+    return (f"Warning: Could not resolve include '{include_str}' from '{includer}' "
+            f"(tried relative to file and relative to root '{root}')")
+
+
+def _resolve_include(root: Path, includer: Path, include_str: str) -> Path | None:
+    """resolve_include() without the warning."""
     root_resolved = root.resolve()
 
     # Try 1: Relative to the includer file
@@ -135,20 +249,191 @@ def resolve_include(root: Path, includer: Path, include_str: str) -> Path | None
         pass
 
     # Both attempts failed
-    print(f"Warning: Could not resolve include '{include_str}' from '{includer}' "
-          f"(tried relative to file and relative to root '{root}')",
-          file=sys.stderr)
     return None
 
 
-def prune_cache_to_existing_files(cache: Cache, root: Path) -> None:
-    """Remove cache entries for files that no longer exist."""
-    to_delete = []
-    for rel in list(cache.keys()):
-        if not (root / rel).is_file():
-            to_delete.append(rel)
-    for rel in to_delete:
+# Maps os.path.normcase()d absolute paths of the plain (non-symlink) source
+# files found by a walk to their paths relative to the scan root
+KnownFiles = Dict[str, str]
+
+
+def _is_lexically_resolvable(include_str: str) -> bool:
+    """
+    Check that normalizing include_str gives the same path as resolving it.
+
+    That holds unless a ".." follows a named component, which might be a
+    symlink. Leading ".." components climb out of the includer's directory,
+    which scanning reached without following symlinks.
+    """
+    if os.altsep:
+        include_str = include_str.replace(os.altsep, os.sep)
+    seen_name = False
+    for part in include_str.split(os.sep):
+        if part == "..":
+            if seen_name:
+                return False
+        elif part and part != ".":
+            seen_name = True
+    return True
+
+
+def _lookup_known_include(root: Path, includer: str, include_str: str, known: KnownFiles) -> Optional[str]:
+    """
+    Resolve an include against the known source files, without touching the filesystem
+    where possible.
+
+    Returns the path relative to root when the include certainly resolves to a
+    known file exactly as _resolve_include() would, or None when that cannot be
+    decided this way (the caller then falls back to _resolve_include()).
+    """
+    if not _is_lexically_resolvable(include_str):
+        return None
+    from_includer = os.path.join(os.path.dirname(includer), include_str)
+    rel = known.get(os.path.normcase(os.path.normpath(from_includer)))
+    if rel is not None:
+        return rel
+    # Only fall through to the root-relative candidate if the includer-relative
+    # one does not exist at all (it may be a file type we don't scan)
+    if os.path.exists(from_includer):
+        return None
+    return known.get(os.path.normcase(os.path.normpath(os.path.join(root, include_str))))
+
+
+def _scan_file(
+    root: Path,
+    file_path: str,
+    known: Optional[KnownFiles] = None,
+    ident: Optional[FileIdentity] = None
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Parse and resolve the includes of one file.
+
+    Module level so worker processes can run it. Warnings are returned
+    rather than printed, so they come out in file order.
+
+    Args:
+        root: Scan root (resolved)
+        file_path: File to parse (a plain string; Path objects are only built
+            for includes that need the slow resolution path)
+        known: Optional map of known source files, letting most includes be
+            resolved without filesystem calls
+        ident: Optional identity of the file, already stat'd by the caller;
+            with it, a file parsed before at that identity is not read again
+
+    Returns:
+        Tuple of (resolved includes relative to root, without duplicates, in
+        the order they are included; missing candidates, see
+        _include_candidates(); warnings)
+    """
+    resolved: List[str] = []
+    missing: List[str] = []
+    warnings: List[str] = []
+    if ident is None:
+        includes = parse_includes(file_path)
+    else:
+        includes = _parse_includes_cached(file_path, ident.size, ident.mtime_ns)
+    for inc in includes:
+        rel = None
+        if known is not None:
+            rel = _lookup_known_include(root, file_path, inc, known)
+        if rel is None:
+            tgt = _resolve_include(root, Path(file_path), inc)
+            if tgt is None:
+                warnings.append(_unresolved_warning(root, Path(file_path), inc))
+            elif tgt.is_file():
+                rel = posix_relpath(tgt, root)
+        if rel is not None:
+            resolved.append(rel)
+        # A file created at an earlier candidate than the one that resolved
+        # (or at any candidate, if none did) changes the result
+        resolved_key = os.path.normcase(rel) if rel is not None else None
+        for candidate in _include_candidates(root, file_path, inc):
+            if os.path.normcase(candidate) == resolved_key:
+                break
+            missing.append(candidate)
+    # Deduplicated in include order; consumers treat includes as a set
+    return list(dict.fromkeys(resolved)), list(dict.fromkeys(missing)), warnings
+
+
+def _include_candidates(root: Path, includer: str, include_str: str) -> List[str]:
+    """
+    Paths relative to root that _resolve_include() tries for an include, in order.
+
+    Candidates are normalized lexically; ones outside root are left out,
+    since scanning never finds files there.
+    """
+    root_str = str(root)
+    prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    candidates = []
+    for base in (os.path.dirname(includer), root_str):
+        path = os.path.normpath(os.path.join(base, include_str))
+        if path.startswith(prefix):
+            rel = path[len(prefix):]
+            candidates.append(rel.replace(os.sep, "/") if os.sep != "/" else rel)
+    return candidates
+
+
+# Known files of the scan a worker process is serving (see _scan_files)
+_worker_known: Optional[KnownFiles] = None
+
+
+def _init_scan_worker(known: KnownFiles) -> None:
+    global _worker_known
+    _worker_known = known
+
+
+def _scan_file_in_worker(
+    root: Path, file_path: str, ident: FileIdentity
+) -> Tuple[List[str], List[str], List[str]]:
+    return _scan_file(root, file_path, _worker_known, ident)
+
+
+def _scan_files(
+    root: Path,
+    files: List[str],
+    idents: List[FileIdentity],
+    known: KnownFiles
+) -> List[Tuple[List[str], List[str], List[str]]]:
+    """
+    Run _scan_file over many files, in worker processes when there are enough.
+
+    Scans can run on a caller's worker thread, so the pool never forks this
+    (possibly multi-threaded) process; it uses forkserver or spawn. The known
+    files map is sent to each worker once, not with every file.
+    """
+    cpu_count = os.cpu_count() or 1
+    if len(files) >= _PROCESS_POOL_MIN_FILES and cpu_count > 1:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=cpu_count, mp_context=context,
+                initializer=_init_scan_worker, initargs=(known,),
+            ) as executor:
+                return list(executor.map(
+                    _scan_file_in_worker, [root] * len(files), files, idents, chunksize=32))
+        except (OSError, BrokenProcessPool):
+            # Parsing has no side effects, so just redo it in-process
+            pass
+    return [_scan_file(root, p, known, ident) for p, ident in zip(files, idents)]
+
+
+def prune_cache_to_existing_files(cache: Cache, existing: Set[str]) -> List[str]:
+    """
+    Remove cache entries for files that no longer exist.
+
+    Args:
+        cache: Cache to prune in place
+        existing: Relative paths of the source files found by walking the
+            scan root, so no file is stat'd again here
+
+    Returns:
+        Relative paths of the removed entries
+    """
+    removed = [rel for rel in cache if rel not in existing]
+    for rel in removed:
         del cache[rel]
+    return removed
 
 
 def scan(root: Path, cache_path: Path, refresh: bool = False) -> Cache:
@@ -163,43 +448,89 @@ def scan(root: Path, cache_path: Path, refresh: bool = False) -> Cache:
     Returns:
         Cache dictionary mapping relative paths to include information
     """
+    with _SCAN_LOCK:
+        return _scan_locked(root, cache_path, refresh)
+
+
+def _scan_locked(root: Path, cache_path: Path, refresh: bool) -> Cache:
+    """Body of scan(); the caller must hold _SCAN_LOCK."""
     root = root.resolve()
     cache = {} if refresh else load_cache(cache_path)
-    prune_cache_to_existing_files(cache, root)
-
-    files = find_source_files(root)
-    for p in files:
-        rel = posix_relpath(p, root)
-        ident = current_identity(p)
+    loaded_count = len(cache)
+
+    # Collect new or changed files, then parse them as one batch. Paths stay
+    # plain strings here; every walked path starts with the root prefix.
+    root_str = str(root)
+    prefix_len = len(root_str if root_str.endswith(os.sep) else root_str + os.sep)
+    stale: List[Tuple[str, FileIdentity, str]] = []
+    known: KnownFiles = {}
+    walked: Set[str] = set()
+    added: Set[str] = set()
+    for path, ident, is_link in _walk_source_files(root):
+        rel = path[prefix_len:]
+        if os.sep != "/":
+            rel = rel.replace(os.sep, "/")
+        walked.add(rel)
+        if not is_link:
+            known[os.path.normcase(path)] = rel
         entry = cache.get(rel)
-        if entry is not None and not needs_rescan(entry, ident):
+        if entry is None:
+            added.add(os.path.normcase(rel))
+        elif not needs_rescan(entry, ident):
             continue
-
-        raw_includes = parse_includes(p)
-        resolved: List[str] = []
-        for inc in raw_includes:
-            tgt = resolve_include(root, p, inc)
-            if tgt and tgt.is_file():
-                resolved.append(posix_relpath(tgt, root))
-
-        cache[rel] = {
+        stale.append((rel, ident, path))
+    removed = set(prune_cache_to_existing_files(cache, walked))
+
+    # An unchanged file still needs its includes resolved again when a file
+    # appeared at one of its missing candidates, or one it included is gone
+    if loaded_count and (added or removed):
+        stale_rels = {rel for rel, _ident, _path in stale}
+        for rel, entry in cache.items():
+            if rel in stale_rels:
+                continue
+            if (any(os.path.normcase(m) in added for m in entry.get("missing", ()))
+                    or any(inc in removed for inc in entry.get("includes", ()))):
+                ident = FileIdentity(size=entry["size"], mtime_ns=entry["mtime_ns"])
+                stale.append((rel, ident, os.path.join(root_str, rel.replace("/", os.sep))))
+
+    results = _scan_files(
+        root,
+        [path for _rel, _ident, path in stale],
+        [ident for _rel, ident, _path in stale],
+        known,
+    )
+    for (rel, ident, _path), (includes, missing, warnings) in zip(stale, results):
+        for warning in warnings:
+            print(warning, file=sys.stderr)
+        entry = {
             "size": ident.size,
             "mtime_ns": ident.mtime_ns,
-            "includes": sorted(set(resolved)),
+            "includes": includes,
         }
+        if missing:
+            entry["missing"] = missing
+        cache[rel] = entry
 
-    save_cache(cache_path, cache)
+    # Only write the cache back if the scan changed it
+    if refresh or stale or len(cache) != loaded_count:
+        save_cache(cache_path, cache)
     return cache
 
 
 def build_graph(cache: Cache) -> Dict[str, Set[str]]:
-    """Build a graph of direct include relationships."""
-    graph: Dict[str, Set[str]] = {k: set() for k in cache.keys()}
+    """
+    Build a graph of direct include relationships.
+
+    Node names are interned, so the dependency lists built from the graph
+    share one string object per file across all projects.
+    """
+    graph: Dict[str, Set[str]] = {sys.intern(k): set() for k in cache.keys()}
     for src, entry in cache.items():
         incs = entry.get("includes", [])
         if isinstance(incs, list):
             for dst in incs:
                 if isinstance(dst, str):
+                    dst = sys.intern(dst)
                     graph.setdefault(src, set()).add(dst)
                     graph.setdefault(dst, set())
     return graph
@@ -207,20 +538,21 @@ def build_graph(cache: Cache) -> Dict[str, Set[str]]:
 
 def build_pairs(cache: Cache) -> Dict[str, str]:
     """Build mapping of .h files to their corresponding .cpp files (same dir & stem)."""
-    by_dir_stem: Dict[Tuple[str, str], Dict[str, str]] = {}
+    # Keys are POSIX-style relative paths, so plain string splitting gives the
+    # same directory, stem and suffix as Path would
+    headers: Dict[Tuple[str, str], str] = {}
+    sources: Dict[Tuple[str, str], str] = {}
     for rel in cache.keys():
-        p = Path(rel)
-        if p.suffix not in {".h", ".cpp"}:
-            continue
-        key = (p.parent.as_posix(), p.stem)
-        slot = by_dir_stem.setdefault(key, {})
-        slot[p.suffix] = rel
+        directory, _, name = rel.rpartition("/")
+        stem, dot, ext = name.rpartition(".")
+        if not stem or not dot:
+            continue  # no suffix (e.g. ".h" is a stem, as for Path)
+        if ext == "h":
+            headers[(directory, stem)] = rel
+        elif ext == "cpp":
+            sources[(directory, stem)] = rel
 
-    pairs: Dict[str, str] = {}
-    for (_dir, _stem), kinds in by_dir_stem.items():
-        if ".h" in kinds and ".cpp" in kinds:
-            pairs[kinds[".h"]] = kinds[".cpp"]
-    return pairs
+    return {h: sources[key] for key, h in headers.items() if key in sources}
 
 
 def build_dependency_graph(cache: Cache) -> Dict[str, Set[str]]:
@@ -241,19 +573,116 @@ def build_dependency_graph(cache: Cache) -> Dict[str, Set[str]]:
 def transitive_reachable(graph: Dict[str, Set[str]], start_rel: str) -> Set[str]:
     """Find all files transitively reachable from start_rel in the graph."""
     visited: Set[str] = set()
-    stack = deque([start_rel])
+    stack = [start_rel]
+    # Locals avoid attribute lookups in the loop
+    pop, push_all, visit, neighbours = stack.pop, stack.extend, visited.add, graph.get
     while stack:
-        node = stack.pop()
+        node = pop()
         if node in visited:
             continue
-        visited.add(node)
-        for nxt in graph.get(node, ()):
-            if nxt not in visited:
-                stack.append(nxt)
+        visit(node)
+        push_all(neighbours(node, ()))
     visited.discard(start_rel)
     return visited
 
 
+class IndexedGraph(NamedTuple):
+    """
+    Dependency graph with files numbered 0..n-1.
+
+    Same edges as build_dependency_graph(), but adjacency is stored as lists
+    of integers, so walks index lists instead of hashing path strings.
+    """
+    names: List[str]             # file for each node (interned)
+    index: Dict[str, int]        # node for each file
+    adj: List[List[int]]         # direct dependencies of each node
+    kind: bytearray              # _KIND_* of each node, by file suffix
+
+
+# Node kinds in IndexedGraph.kind
+_KIND_OTHER = 0
+_KIND_CPP = 1
+_KIND_HEADER = 2
+
+
+def build_indexed_graph(cache: Cache) -> IndexedGraph:
+    """Build the dependency graph of build_dependency_graph() in indexed form."""
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    adj: List[List[int]] = []
+    kind = bytearray()
+
+    def node(name: str) -> int:
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(sys.intern(name))
+            adj.append([])
+            if _has_suffix(name, ".cpp"):
+                kind.append(_KIND_CPP)
+            elif _has_suffix(name, ".h"):
+                kind.append(_KIND_HEADER)
+            else:
+                kind.append(_KIND_OTHER)
+        return i
+
+    for src in cache.keys():
+        node(src)
+    for src, entry in cache.items():
+        incs = entry.get("includes", [])
+        if isinstance(incs, list):
+            edges = adj[index[src]]
+            for dst in incs:
+                if isinstance(dst, str):
+                    edges.append(node(dst))
+    for h, cpp in build_pairs(cache).items():
+        adj[node(h)].append(node(cpp))  # implied dependency
+    return IndexedGraph(names, index, adj, kind)
+
+
+def reachable_indices(adj: List[List[int]], start: int) -> List[int]:
+    """Nodes transitively reachable from start (excluding start), as in transitive_reachable()."""
+    seen = bytearray(len(adj))
+    seen[start] = 1
+    stack = [start]
+    found: List[int] = []
+    pop, push, add = stack.pop, stack.append, found.append
+    while stack:
+        for nxt in adj[pop()]:
+            if not seen[nxt]:
+                seen[nxt] = 1
+                add(nxt)
+                push(nxt)
+    return found
+
+
+def _reachable_split(graph: IndexedGraph, start: int) -> Tuple[List[int], List[int]]:
+    """
+    reachable_indices(), keeping only .cpp and .h nodes, in separate lists.
+
+    Files are sorted into their list as they are found, so no list of all
+    reachable nodes is built and filtered afterwards.
+    """
+    adj, kind = graph.adj, graph.kind
+    seen = bytearray(len(adj))
+    seen[start] = 1
+    stack = [start]
+    cpp: List[int] = []
+    headers: List[int] = []
+    pop, push = stack.pop, stack.append
+    while stack:
+        for nxt in adj[pop()]:
+            if not seen[nxt]:
+                seen[nxt] = 1
+                k = kind[nxt]
+                if k == _KIND_CPP:
+                    cpp.append(nxt)
+                elif k == _KIND_HEADER:
+                    headers.append(nxt)
+                push(nxt)
+    return cpp, headers
+
+
 def ensure_file_in_cache(root: Path, cache: Cache, file_path: Path) -> str:
     """
     Ensure a file is in the cache, adding it temporarily if needed.
@@ -270,64 +699,204 @@ def ensure_file_in_cache(root: Path, cache: Cache, file_path: Path) -> str:
         if not file_path.is_file():
             raise FileNotFoundError(f"File '{rel_path}' does not exist")
 
-        raw_includes = parse_includes(file_path)
-        resolved: List[str] = []
-        for inc in raw_includes:
-            tgt = resolve_include(root, file_path, inc)
-            if tgt and tgt.is_file():
-                resolved.append(posix_relpath(tgt, root))
-
-        cache[rel_path] = {
-            "size": file_path.stat().st_size,
-            "mtime_ns": file_path.stat().st_mtime_ns,
-            "includes": sorted(set(resolved)),
+        ident = current_identity(file_path)
+        includes, missing, warnings = _scan_file(root, str(file_path), ident=ident)
+        for warning in warnings:
+            print(warning, file=sys.stderr)
+
+        entry = {
+            "size": ident.size,
+            "mtime_ns": ident.mtime_ns,
+            "includes": includes,
         }
+        if missing:
+            entry["missing"] = missing
+        cache[rel_path] = entry
 
     return rel_path
 
 
-def get_cpp_dependencies(repo_root: Path, start_file: Path, refresh: bool = False, include_headers: bool = False) -> List[str]:
+def _has_suffix(rel: str, suffix: str) -> bool:
+    """Path(rel).suffix == suffix, for a POSIX-style relative path, without building a Path."""
+    # The suffix must follow a non-empty file name: ".h" alone has no suffix
+    return rel.endswith(suffix) and rel[-len(suffix) - 1:-len(suffix)] not in ("", "/")
+
+
+_EMPTY_RESULT = DepResult(cpp_files=(), header_files=(), all_files=())
+
+
+def _is_leaf(cache: Cache, rel: str) -> bool:
+    """True if rel has no edges in the dependency graph (no includes, no .cpp partner)."""
+    if cache[rel].get("includes"):
+        return False
+    # Only a header gets an implied edge, to the .cpp with the same dir & stem
+    # (see build_pairs)
+    if rel.endswith(".h") and not rel.endswith("/.h") and rel != ".h":
+        return rel[:-2] + ".cpp" not in cache
+    return True
+
+
+def get_dependency_result(
+    repo_root: Path,
+    start_file: Path,
+    refresh: bool = False,
+    cache: Optional[Dict[Any, Any]] = None
+) -> DepResult:
     """
-    Get all .cpp file dependencies for a given start file.
+    Resolve all dependencies of a start file in a single graph walk.
 
-    This includes all .cpp files that are transitively reachable through:
-    - Direct #include relationships
-    - Implicit header->source relationships (same directory and stem)
+    get_cpp_dependencies() and get_cpp_dependencies_split() are views of
+    this result.
 
     Args:
         repo_root: Repository root directory (contains ./src, cache stored here)
         start_file: The starting .cpp or .h file (absolute path)
         refresh: If True, rebuild cache from scratch
-        include_headers: If True, also return .h files in dependencies
+        cache: Optional dict shared by calls within one invocation. The source
+            tree is then scanned and its dependency graph built once, and the
+            result for each start file is computed once; later calls (with
+            any filter) reuse all of them.
 
     Returns:
-        Sorted list of relative paths to .cpp dependencies (and .h if include_headers=True)
+        DepResult of sorted paths relative to ./src. The start file itself is
+        never included.
     """
     repo_root = repo_root.resolve()
     src_root = repo_root / "src"
     start_file = start_file.resolve()
     cache_path = repo_root / CACHE_FILENAME
 
-    # Scan and build cache (scan under src directory)
-    cache = scan(src_root, cache_path, refresh=refresh)
+    if cache is None:
+        # Scan and build cache (scan under src directory)
+        include_cache = scan(src_root, cache_path, refresh=refresh)
 
-    # Ensure start file is in cache
-    start_rel = ensure_file_in_cache(src_root, cache, start_file)
+        # Ensure start file is in cache
+        start_rel = ensure_file_in_cache(src_root, include_cache, start_file)
+        if _is_leaf(include_cache, start_rel):
+            return _EMPTY_RESULT
 
-    # Build dependency graph and find reachable files
-    dep_graph = build_dependency_graph(cache)
-    reachable = transitive_reachable(dep_graph, start_rel)
-
-    # Filter based on include_headers flag
-    if include_headers:
-        # Include both .cpp and .h files
-        filtered_files = [f for f in reachable if Path(f).suffix in {".cpp", ".h"}]
+        # Build dependency graph
+        dep_graph = build_indexed_graph(include_cache)
     else:
-        # Only .cpp files
-        filtered_files = [f for f in reachable if Path(f).suffix == ".cpp"]
+        result_key = ("deps", str(start_file))
+        result = cache.get(result_key)
+        if result is not None:
+            return result
+
+        with _SCAN_LOCK:
+            key = ("scan", str(src_root))
+            include_cache = cache.get(key)
+            if include_cache is None:
+                include_cache = scan(src_root, cache_path, refresh=refresh)
+                cache[key] = include_cache
+            start_rel = ensure_file_in_cache(src_root, include_cache, start_file)
+            if _is_leaf(include_cache, start_rel):
+                cache[result_key] = _EMPTY_RESULT
+                return _EMPTY_RESULT
+
+            # The graph only changes when ensure_file_in_cache() adds a file,
+            # so it is rebuilt only when the number of scanned files changed
+            graph_key = ("graph", str(src_root))
+            memo = cache.get(graph_key)
+            if memo is not None and memo[0] == len(include_cache):
+                dep_graph = memo[1]
+            else:
+                dep_graph = build_indexed_graph(include_cache)
+                cache[graph_key] = (len(include_cache), dep_graph)
+
+    # Find reachable files, keeping only .cpp and .h files as they are found
+    cpp_nodes, header_nodes = _reachable_split(dep_graph, dep_graph.index[start_rel])
+
+    names = dep_graph.names
+    cpp_files = [names[i] for i in cpp_nodes]
+    header_files = [names[i] for i in header_nodes]
+    cpp_files.sort()
+    header_files.sort()
+    result = DepResult(
+        cpp_files=tuple(cpp_files),
+        header_files=tuple(header_files),
+        all_files=tuple(sorted(cpp_files + header_files)),
+    )
+    if cache is not None:
+        cache[result_key] = result
+    return result
+
+
+def get_cpp_dependencies_split(
+    repo_root: Path,
+    start_file: Path,
+    refresh: bool = False,
+    cache: Optional[Dict[Any, Any]] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Get .cpp and .h file dependencies for a given start file in a single graph walk.
+
+    Reachability is the same as for get_cpp_dependencies(); the result is
+    partitioned by extension instead of filtered.
+
+    Args:
+        repo_root: Repository root directory (contains ./src, cache stored here)
+        start_file: The starting .cpp or .h file (absolute path)
+        refresh: If True, rebuild cache from scratch
+        cache: Optional dict shared by calls within one invocation (see
+            get_dependency_result)
 
-    # Exclude the start file itself if it's a .cpp
-    if Path(start_rel).suffix == ".cpp" and start_rel in filtered_files:
-        filtered_files.remove(start_rel)
+    Returns:
+        Tuple of (sorted .cpp dependencies, sorted .h dependencies), as paths
+        relative to ./src. The start file itself is never included.
+    """
+    result = get_dependency_result(repo_root, start_file, refresh=refresh, cache=cache)
+    return list(result.cpp_files), list(result.header_files)
 
-    return sorted(filtered_files)
+
+def warmup_dep_cache(
+    repo_root: Path,
+    start_files: Iterable[Path],
+    cache: Dict[Any, Any],
+    refresh: bool = False,
+    max_workers: int = 16
+) -> None:
+    """
+    Resolve dependencies for many start files concurrently, filling cache.
+
+    Later get_cpp_dependencies() calls with the same cache return the stored
+    results. Errors are ignored here; the later call raises them again.
+    """
+    def resolve(start_file: Path) -> None:
+        try:
+            get_dependency_result(repo_root, start_file, refresh=refresh, cache=cache)
+        except Exception:
+            pass
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(resolve, start_files):
+            pass
+
+
+def get_cpp_dependencies(
+    repo_root: Path,
+    start_file: Path,
+    refresh: bool = False,
+    include_headers: bool = False,
+    cache: Optional[Dict[Any, Any]] = None
+) -> List[str]:
+    """
+    Get all .cpp file dependencies for a given start file.
+
+    This includes all .cpp files that are transitively reachable through:
+    - Direct #include relationships
+    - Implicit header->source relationships (same directory and stem)
+
+    Args:
+        repo_root: Repository root directory (contains ./src, cache stored here)
+        start_file: The starting .cpp or .h file (absolute path)
+        refresh: If True, rebuild cache from scratch
+        include_headers: If True, also return .h files in dependencies
+        cache: Optional dict shared by calls within one invocation, so the
+            source tree is scanned only once (see get_dependency_result)
+
+    Returns:
+        Sorted list of relative paths to .cpp dependencies (and .h if include_headers=True)
+    """
+    result = get_dependency_result(repo_root, start_file, refresh=refresh, cache=cache)
+    return list(result.all_files if include_headers else result.cpp_files)
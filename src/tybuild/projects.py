@@ -46,27 +46,34 @@ def discover_projects(base_path: Path | None = None) -> List[Project]:
 
     project_dir = base_path / "src" / "project"
 
-    if not project_dir.exists() or not project_dir.is_dir():
+    if not os.path.isdir(project_dir):
         return []
 
     projects: List[Project] = []
 
-    # Iterate through immediate subdirectories (project types)
-    for type_dir_path in project_dir.iterdir():
-        if not type_dir_path.is_dir():
-            continue
+    # Iterate through immediate subdirectories (project types); scandir
+    # entries answer is_dir()/is_file() without a separate stat per entry
+    with os.scandir(project_dir) as type_entries:
+        type_dirs = [entry for entry in type_entries if entry.is_dir()]
 
-        project_type = type_dir_path.name
+    for type_entry in type_dirs:
+        project_type = type_entry.name
 
         # Find all .cpp files in this type directory
-        for entry in type_dir_path.iterdir():
-            if entry.is_file() and entry.suffix == ".cpp":
-                project_name = entry.stem
-                projects.append(Project(
-                    name=project_name,
-                    type=project_type,
-                    cpp_file=entry
-                ))
+        with os.scandir(type_entry.path) as entries:
+            for entry in entries:
+                name = entry.name
+                # Same test as Path(name).suffix == ".cpp": the suffix needs
+                # something before it, so ".cpp" is not a project but "..cpp"
+                # is (named ".")
+                if not name.endswith(".cpp") or name == ".cpp":
+                    continue
+                if entry.is_file():
+                    projects.append(Project(
+                        name=name[:-4],
+                        type=project_type,
+                        cpp_file=Path(entry.path)
+                    ))
 
     # Sort by type first, then by name for consistent output
     projects.sort(key=lambda p: (p.type, p.name))
@@ -3,20 +3,49 @@ Visual Studio project template processing for tybuild.
 
 Handles generation of Visual Studio project files from templates,
 including deterministic GUID generation for projects.
+
+Before optimizing generation further, run scripts/profile_vs_templates.py
+to see whether time goes to ElementTree, string building or file I/O.
 """
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import io
+import multiprocessing
 import os
 import re
-import uuid
 import xml.etree.ElementTree as ET
+import xml.sax.saxutils
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 VC_PROJECT_TYPE_GUID = "{8BC9CEB8-8B4A-11D0-8D11-00A0C91BC942}"
 
+_MSBUILD_NS = "http://schemas.microsoft.com/developer/msbuild/2003"
+
+# Below this many projects to generate, worker process startup costs more
+# than generating the projects in this process
+_PROCESS_POOL_MIN_JOBS = 16
+
+# Characters ElementTree escapes in attribute values, beyond &, < and >
+_XML_ATTR_ENTITIES = {'"': "&quot;", "\r": "&#13;", "\n": "&#10;", "\t": "&#09;"}
+
+# Matches the <ProjectGuid> of a <PropertyGroup Label="Globals">, staying inside
+# that group, whose text is the GUID either in balanced braces or bare
+_PROJECT_GUID_RE = re.compile(
+    rb'<PropertyGroup\s+Label="Globals"\s*>'
+    rb"(?:(?!</PropertyGroup>).){0,4096}?"
+    rb"<ProjectGuid>\s*(?:\{([0-9A-Fa-f-]{36})\}|([0-9A-Fa-f-]{36}))\s*</ProjectGuid>",
+    re.DOTALL,
+)
+
+# SHA-256 state after the fixed "tybuild:" seed prefix, copied per GUID
+_GUID_SEED_HASH = hashlib.sha256(b"tybuild:")
+
+@functools.lru_cache(maxsize=None)
 def generate_project_guid(project_type: str, project_name: str) -> str:
     """
     Generate a deterministic GUID for a Visual Studio project.
@@ -24,26 +53,30 @@ def generate_project_guid(project_type: str, project_name: str) -> str:
     The GUID is generated deterministically based on the project type and name,
     ensuring that the same project type/name combination always produces the
     same GUID. This is useful for consistent project file generation.
+    Results are memoized, since the function is pure.
+
+    The GUID is the first 16 bytes of SHA-256("tybuild:<type>:<name>") with
+    the RFC 4122 version 5 and variant bits set. It is not a true uuid5
+    (which hashes with SHA-1 in a namespace); the algorithm must never
+    change, since existing solutions, project references and the .tybuild
+    cache all hold the GUIDs it has produced.
 
     Args:
         project_type: The type of the project (e.g., 'console', 'gui', 'library')
         project_name: The name of the project (e.g., 'Server', 'Client')
 
     Returns:
-        A GUID string in the format "{XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX}"
+        A GUID string in the format "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX"
         (uppercase, without braces)
 
     Example:
         >>> generate_project_guid('console', 'Server')
         '12345678-1234-5678-1234-567812345678'  # deterministic result
     """
-    salt = "tybuild"
-
-    # Combine salt, project type, and project name
-    seed = f"{salt}:{project_type}:{project_name}"
-
-    # Use SHA-256 to hash the seed
-    hash_bytes = hashlib.sha256(seed.encode('utf-8')).digest()
+    # Hash the seed "tybuild:<type>:<name>", continuing from the salt prefix
+    seed_hash = _GUID_SEED_HASH.copy()
+    seed_hash.update(f"{project_type}:{project_name}".encode('utf-8'))
+    hash_bytes = seed_hash.digest()
 
     # Take the first 16 bytes and create a UUID from them
     # Using UUID version 5 format (name-based using SHA-1, but we're using our own hash)
@@ -56,23 +89,46 @@ def generate_project_guid(project_type: str, project_name: str) -> str:
     # Set variant to RFC 4122 - bits 6-7 of clock_seq_hi_and_reserved
     guid_bytes[8] = (guid_bytes[8] & 0x3F) | 0x80
 
-    # Create UUID from bytes
-    generated_uuid = uuid.UUID(bytes=bytes(guid_bytes))
-
-    # Format as uppercase with braces
-    return str(generated_uuid).upper()
+    # Format as uppercase 8-4-4-4-12 hex, without braces
+    hx = guid_bytes.hex().upper()
+    return f"{hx[0:8]}-{hx[8:12]}-{hx[12:16]}-{hx[16:20]}-{hx[20:32]}"
 
 
 # ---------------------- Solution file utilities ----------------------
 
+# Configuration platforms
+_SOLUTION_CONFIGURATIONS = ["Debug|x64", "Release|x64", "MinSizeRel|x64", "RelWithDebInfo|x64"]
+
+# ProjectConfigurationPlatforms lines of one project, for every configuration:
+# ActiveCfg only, or ActiveCfg and Build.0. {guid} is the braced project GUID.
+_ACTIVE_CFG_BLOCK = "".join(
+    f"\t\t{{guid}}.{config}.ActiveCfg = {config}\n" for config in _SOLUTION_CONFIGURATIONS)
+_BUILD_CFG_BLOCK = "".join(
+    f"\t\t{{guid}}.{config}.ActiveCfg = {config}\n\t\t{{guid}}.{config}.Build.0 = {config}\n"
+    for config in _SOLUTION_CONFIGURATIONS)
+
+# SolutionConfigurationPlatforms lines
+_SOLUTION_CFG_PLATFORMS_BLOCK = "".join(
+    f"\t\t{config} = {config}\n" for config in _SOLUTION_CONFIGURATIONS)
+
+# Project entry of a user project, which depends on ONE_CHECK only
+_USER_PROJECT_ENTRY = (
+    'Project("' + VC_PROJECT_TYPE_GUID.replace("{", "{{").replace("}", "}}")
+    + '") = "{name}", "{name}.vcxproj", "{guid}"\n'
+    "\tProjectSection(ProjectDependencies) = postProject\n"
+    "\t\t{one_check_guid} = {one_check_guid}\n"
+    "\tEndProjectSection\n"
+    "EndProject\n")
+
 def generate_solution(
     output_sln_path: Path,
     solution_guid: str,
     all_build_guid: str,
     zero_check_guid: str,
     one_check_guid: str,
-    projects_to_add: List[Tuple[str, str]]
-) -> None:
+    projects_to_add: List[Tuple[str, str]],
+    force: bool = False
+) -> bool:
     """
     Generate a solution file with ALL_BUILD, ZERO_CHECK, and ONE_CHECK projects, plus user projects.
 
@@ -88,6 +144,10 @@ def generate_solution(
         zero_check_guid: GUID for the ZERO_CHECK project
         one_check_guid: GUID for the ONE_CHECK project
         projects_to_add: List of (project_name, project_guid) tuples for projects to add to the solution
+        force: If True, write the file even if its content is unchanged
+
+    Returns:
+        True if the file was written, False if it already had this content
 
     Example:
         generate_solution(
@@ -106,104 +166,138 @@ def generate_solution(
     all_build_guid = "{" + all_build_guid + "}"
     zero_check_guid = "{" + zero_check_guid + "}"
     one_check_guid = "{" + one_check_guid + "}"
+    # Each user project's name and braced GUID, used by three sections
+    braced_projects = [(name, "{" + guid + "}") for name, guid in projects_to_add]
 
-    # Configuration platforms
-    configurations = ["Debug|x64", "Release|x64", "MinSizeRel|x64", "RelWithDebInfo|x64"]
-
-    # Start building the solution content
-    lines = []
+    # Start building the solution content, one line per write() into a
+    # single buffer
+    buf = io.StringIO()
+    w = buf.write
 
     # BOM and header
-    lines.append("\ufeff")  # UTF-8 BOM
-    lines.append("Microsoft Visual Studio Solution File, Format Version 12.00")
-    lines.append("# Visual Studio Version 17")
+    w("\ufeff\n")  # UTF-8 BOM
+    w("Microsoft Visual Studio Solution File, Format Version 12.00\n")
+    w("# Visual Studio Version 17\n")
 
     # ALL_BUILD project (depends on all other projects)
-    lines.append(f'Project("{VC_PROJECT_TYPE_GUID}") = "ALL_BUILD", "ALL_BUILD.vcxproj", "{all_build_guid}"')
-    lines.append("\tProjectSection(ProjectDependencies) = postProject")
+    w(f'Project("{VC_PROJECT_TYPE_GUID}") = "ALL_BUILD", "ALL_BUILD.vcxproj", "{all_build_guid}"\n')
+    w("\tProjectSection(ProjectDependencies) = postProject\n")
     # ALL_BUILD depends on all user projects, ONE_CHECK, and ZERO_CHECK
-    for project_name, project_guid in projects_to_add:
-        formatted_guid = '{' + project_guid + '}'
-        lines.append(f"\t\t{formatted_guid} = {formatted_guid}")
-    lines.append(f"\t\t{one_check_guid} = {one_check_guid}")
-    lines.append(f"\t\t{zero_check_guid} = {zero_check_guid}")
-    lines.append("\tEndProjectSection")
-    lines.append("EndProject")
+    for _, formatted_guid in braced_projects:
+        w(f"\t\t{formatted_guid} = {formatted_guid}\n")
+    w(f"\t\t{one_check_guid} = {one_check_guid}\n")
+    w(f"\t\t{zero_check_guid} = {zero_check_guid}\n")
+    w("\tEndProjectSection\n")
+    w("EndProject\n")
 
     # User projects (each depends on ONE_CHECK only)
-    for project_name, project_guid in projects_to_add:
-        formatted_guid = '{' + project_guid + '}'
-        lines.append(f'Project("{VC_PROJECT_TYPE_GUID}") = "{project_name}", "{project_name}.vcxproj", "{formatted_guid}"')
-        lines.append("\tProjectSection(ProjectDependencies) = postProject")
-        lines.append(f"\t\t{one_check_guid} = {one_check_guid}")
-        lines.append("\tEndProjectSection")
-        lines.append("EndProject")
+    user_entry = _USER_PROJECT_ENTRY.format
+    for project_name, formatted_guid in braced_projects:
+        w(user_entry(name=project_name, guid=formatted_guid, one_check_guid=one_check_guid))
 
     # ONE_CHECK project (depends on ZERO_CHECK)
-    lines.append(f'Project("{VC_PROJECT_TYPE_GUID}") = "ONE_CHECK", "ONE_CHECK.vcxproj", "{one_check_guid}"')
-    lines.append("\tProjectSection(ProjectDependencies) = postProject")
-    lines.append(f"\t\t{zero_check_guid} = {zero_check_guid}")
-    lines.append("\tEndProjectSection")
-    lines.append("EndProject")
+    w(f'Project("{VC_PROJECT_TYPE_GUID}") = "ONE_CHECK", "ONE_CHECK.vcxproj", "{one_check_guid}"\n')
+    w("\tProjectSection(ProjectDependencies) = postProject\n")
+    w(f"\t\t{zero_check_guid} = {zero_check_guid}\n")
+    w("\tEndProjectSection\n")
+    w("EndProject\n")
 
     # ZERO_CHECK project (no dependencies)
-    lines.append(f'Project("{VC_PROJECT_TYPE_GUID}") = "ZERO_CHECK", "ZERO_CHECK.vcxproj", "{zero_check_guid}"')
-    lines.append("\tProjectSection(ProjectDependencies) = postProject")
-    lines.append("\tEndProjectSection")
-    lines.append("EndProject")
+    w(f'Project("{VC_PROJECT_TYPE_GUID}") = "ZERO_CHECK", "ZERO_CHECK.vcxproj", "{zero_check_guid}"\n')
+    w("\tProjectSection(ProjectDependencies) = postProject\n")
+    w("\tEndProjectSection\n")
+    w("EndProject\n")
 
     # Global section
-    lines.append("Global")
+    w("Global\n")
 
     # Solution configurations
-    lines.append("\tGlobalSection(SolutionConfigurationPlatforms) = preSolution")
-    for config in configurations:
-        lines.append(f"\t\t{config} = {config}")
-    lines.append("\tEndGlobalSection")
+    w("\tGlobalSection(SolutionConfigurationPlatforms) = preSolution\n")
+    w(_SOLUTION_CFG_PLATFORMS_BLOCK)
+    w("\tEndGlobalSection\n")
 
     # Project configurations
-    lines.append("\tGlobalSection(ProjectConfigurationPlatforms) = postSolution")
+    w("\tGlobalSection(ProjectConfigurationPlatforms) = postSolution\n")
 
     # ALL_BUILD: ActiveCfg only (no Build.0)
-    for config in configurations:
-        config_name = config.split('|')[0]
-        lines.append(f"\t\t{all_build_guid}.{config}.ActiveCfg = {config}")
+    w(_ACTIVE_CFG_BLOCK.format(guid=all_build_guid))
 
     # User projects: ActiveCfg and Build.0
-    for project_name, project_guid in projects_to_add:
-        formatted_guid = '{' + project_guid + '}'
-        for config in configurations:
-            config_name = config.split('|')[0]
-            lines.append(f"\t\t{formatted_guid}.{config}.ActiveCfg = {config}")
-            lines.append(f"\t\t{formatted_guid}.{config}.Build.0 = {config}")
+    for _, formatted_guid in braced_projects:
+        w(_BUILD_CFG_BLOCK.format(guid=formatted_guid))
 
     # ONE_CHECK: ActiveCfg and Build.0
-    for config in configurations:
-        config_name = config.split('|')[0]
-        lines.append(f"\t\t{one_check_guid}.{config}.ActiveCfg = {config}")
-        lines.append(f"\t\t{one_check_guid}.{config}.Build.0 = {config}")
+    w(_BUILD_CFG_BLOCK.format(guid=one_check_guid))
 
     # ZERO_CHECK: ActiveCfg and Build.0
-    for config in configurations:
-        config_name = config.split('|')[0]
-        lines.append(f"\t\t{zero_check_guid}.{config}.ActiveCfg = {config}")
-        lines.append(f"\t\t{zero_check_guid}.{config}.Build.0 = {config}")
+    w(_BUILD_CFG_BLOCK.format(guid=zero_check_guid))
 
-    lines.append("\tEndGlobalSection")
+    w("\tEndGlobalSection\n")
 
     # Extensibility sections
-    lines.append("\tGlobalSection(ExtensibilityGlobals) = postSolution")
-    lines.append(f"\t\tSolutionGuid = {solution_guid}")
-    lines.append("\tEndGlobalSection")
-    lines.append("\tGlobalSection(ExtensibilityAddIns) = postSolution")
-    lines.append("\tEndGlobalSection")
+    w("\tGlobalSection(ExtensibilityGlobals) = postSolution\n")
+    w(f"\t\tSolutionGuid = {solution_guid}\n")
+    w("\tEndGlobalSection\n")
+    w("\tGlobalSection(ExtensibilityAddIns) = postSolution\n")
+    w("\tEndGlobalSection\n")
 
-    lines.append("EndGlobal")
-    lines.append("")  # Trailing newline
+    w("EndGlobal\n")
 
     # Write to file
-    content = "\n".join(lines)
-    output_sln_path.write_text(content, encoding='utf-8-sig')
+    content = buf.getvalue()
+    return write_text_if_changed(output_sln_path, content, 'utf-8-sig', force)
+
+def write_text_if_changed(path: Path, text: str, encoding: str, force: bool = False) -> bool:
+    """
+    Write text like Path.write_text(), unless the file already holds exactly those bytes.
+
+    Leaving unchanged files alone keeps their mtimes stable, so MSBuild does
+    not treat a no-op regeneration as a project change.
+
+    Returns:
+        True if the file was written
+    """
+    return write_bytes_if_changed(path, text.encode(encoding), force)
+
+
+def write_bytes_if_changed(path: Path, data: bytes, force: bool = False) -> bool:
+    """
+    write_text_if_changed() for content that is already encoded.
+
+    Newlines are translated to os.linesep as write_text() would; the
+    encodings used here all encode "\n" as the single byte b"\n".
+
+    Returns:
+        True if the file was written
+    """
+    if os.linesep != "\n":
+        data = data.replace(b"\n", os.linesep.encode("ascii"))
+    if not force:
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+    _write_bytes(path, data)
+    return True
+
+
+# Flags for _write_bytes(); O_BINARY stops Windows from translating newlines
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """
+    Path.write_bytes() without the buffered file object: the already encoded
+    content goes to the file descriptor directly, normally in one write.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 # ---------------------- Project file utilities ----------------------
 
@@ -214,14 +308,16 @@ def _detect_ns(root) -> str:
     return "http://schemas.microsoft.com/developer/msbuild/2003"
 
 
+@functools.lru_cache(maxsize=64)
 def _ns_tag(ns: str, tag: str) -> str:
-    """Create a namespaced XML tag."""
+    """Create a namespaced XML tag (memoized; only a few distinct tags are used)."""
     return f"{{{ns}}}{tag}"
 
 
 def _backslash(path: str) -> str:
     """Convert path to Windows backslash format."""
-    return path.replace("/", "\\").replace(os.sep, "\\")
+    # os.sep is "/" or "\\", so a second replace of os.sep would be a no-op
+    return path.replace("/", "\\")
 
 
 def get_project_guid(project_file_path: Path) -> Optional[str]:
@@ -239,8 +335,19 @@ def get_project_guid(project_file_path: Path) -> Optional[str]:
         '954D3659-7E49-38DA-AAF3-DE9306D58F9B'
     """
     try:
-        xml_text = project_file_path.read_text(encoding="utf-8", errors="replace")
-        root = ET.fromstring(xml_text)
+        data = project_file_path.read_bytes()
+    except OSError:
+        return None
+
+    # Fast path for generated files; comments could hide or fake the match
+    if b"<!--" not in data:
+        m = _PROJECT_GUID_RE.search(data)
+        if m:
+            return (m.group(1) or m.group(2)).decode("ascii")
+
+    # Fall back to a full parse for unusual layouts
+    try:
+        root = ET.fromstring(data.decode("utf-8", errors="replace"))
         ns = _detect_ns(root)
 
         # Find Globals PropertyGroup
@@ -259,21 +366,39 @@ def get_project_guid(project_file_path: Path) -> Optional[str]:
         return None
 
 
-def _replace_guid_in_vcxproj(xml_text: str, new_guid: str) -> str:
-    """
-    Replace the ProjectGuid in a vcxproj XML file.
-
-    Args:
-        xml_text: The vcxproj file content as XML string
-        new_guid: New GUID without braces
-
-    Returns:
-        Updated XML text with new GUID
-    """
+def _parse_project_xml(xml_text: str):
+    """Parse a project file, returning (root element, namespace)."""
     root = ET.fromstring(xml_text)
     ns = _detect_ns(root)
     ET.register_namespace("", ns)
+    return root, ns
+
+
+def _serialize_project_xml(root) -> str:
+    """Serialize a project file parsed with _parse_project_xml()."""
+    return _serialize_project_xml_bytes(root).decode("utf-8")
+
+
+def _serialize_project_xml_bytes(root) -> bytes:
+    """_serialize_project_xml() as the UTF-8 bytes ElementTree produces, without decoding them."""
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
 
+
+def _remove_items(root, ns: str, item: str) -> None:
+    """
+    Remove every item of one kind (e.g. ClCompile) from the project's ItemGroups.
+
+    Each ItemGroup's children are filtered in one pass; removing them one at
+    a time would rescan the group for every item.
+    """
+    tag = _ns_tag(ns, item)
+    for ig in root.findall(_ns_tag(ns, "ItemGroup")):
+        if ig.find(tag) is not None:
+            ig[:] = [child for child in ig if child.tag != tag]
+
+
+def _replace_guid(root, ns: str, new_guid: str) -> None:
+    """Set the ProjectGuid (without braces) in a parsed vcxproj, in place."""
     # Find or create Globals PropertyGroup
     globals_pg = None
     for pg in root.findall(_ns_tag(ns, "PropertyGroup")):
@@ -291,108 +416,67 @@ def _replace_guid_in_vcxproj(xml_text: str, new_guid: str) -> str:
     # Set GUID with braces for XML format
     guid_el.text = "{" + new_guid + "}"
 
-    return ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8")
-
-
-def _replace_sources_in_vcxproj(xml_text: str, sources: List[str]) -> str:
-    """
-    Replace all ClCompile (source file) entries in a vcxproj file.
-
-    Args:
-        xml_text: The vcxproj file content as XML string
-        sources: List of source file paths to include
-
-    Returns:
-        Updated XML text with new sources
-    """
-    root = ET.fromstring(xml_text)
-    ns = _detect_ns(root)
-    ET.register_namespace("", ns)
 
+def _replace_sources(root, ns: str, sources: List[str]) -> None:
+    """Replace all ClCompile (source file) entries in a parsed vcxproj, in place."""
     # Remove all existing ClCompile elements
-    for ig in root.findall(_ns_tag(ns, "ItemGroup")):
-        for cc in list(ig.findall(_ns_tag(ns, "ClCompile"))):
-            ig.remove(cc)
+    _remove_items(root, ns, "ClCompile")
 
     # Add new sources if any
     if sources:
         ig = ET.SubElement(root, _ns_tag(ns, "ItemGroup"))
-        for s in sources:
-            ET.SubElement(ig, _ns_tag(ns, "ClCompile"), {"Include": _backslash(s)})
-
-    return ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8")
+        cl_compile = _ns_tag(ns, "ClCompile")
+        # One extend() of unparented elements is cheaper than a
+        # SubElement() call per source
+        element = ET.Element
+        ig.extend([element(cl_compile, {"Include": _backslash(s)}) for s in sources])
 
 
-def _remove_custom_build_in_vcxproj(xml_text: str) -> str:
+def _remove_custom_build(root, ns: str) -> None:
     """
-    Remove all CustomBuild entries from a vcxproj file.
+    Remove all CustomBuild entries from a parsed vcxproj, in place.
 
-    This removes CMake-generated custom build steps (typically for CMakeLists.txt)
-    that are not needed in tybuild-generated projects.
-
-    Args:
-        xml_text: The vcxproj file content as XML string
-
-    Returns:
-        Updated XML text with CustomBuild elements removed
+    These are CMake-generated custom build steps (typically for
+    CMakeLists.txt) that are not needed in tybuild-generated projects.
     """
-    root = ET.fromstring(xml_text)
-    ns = _detect_ns(root)
-    ET.register_namespace("", ns)
-
     # Remove all CustomBuild elements and clean up empty ItemGroups
-    for ig in list(root.findall(_ns_tag(ns, "ItemGroup"))):
-        for cb in list(ig.findall(_ns_tag(ns, "CustomBuild"))):
-            ig.remove(cb)
-        # Remove ItemGroup if it's now empty
-        if len(ig) == 0:
-            root.remove(ig)
-
-    return ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8")
+    _remove_items(root, ns, "CustomBuild")
+    item_group = _ns_tag(ns, "ItemGroup")
+    root[:] = [child for child in root if child.tag != item_group or len(child)]
 
 
-def _replace_sources_in_filters(xml_text: str, sources: List[str]) -> str:
-    """
-    Replace all ClCompile (source file) entries in a vcxproj.filters file.
-
-    Args:
-        xml_text: The .filters file content as XML string
-        sources: List of source file paths to include
-
-    Returns:
-        Updated XML text with new sources
-    """
-    root = ET.fromstring(xml_text)
-    ns = _detect_ns(root)
-    ET.register_namespace("", ns)
-
+def _replace_filter_sources(root, ns: str, sources: List[str]) -> None:
+    """Replace all ClCompile (source file) entries in a parsed vcxproj.filters, in place."""
     # Remove all existing ClCompile elements
-    for ig in root.findall(_ns_tag(ns, "ItemGroup")):
-        for cc in list(ig.findall(_ns_tag(ns, "ClCompile"))):
-            ig.remove(cc)
+    _remove_items(root, ns, "ClCompile")
 
     # Ensure "Source Files" filter exists
     def ensure_source_filter():
+        filter_tag = _ns_tag(ns, "Filter")
         for ig in root.findall(_ns_tag(ns, "ItemGroup")):
-            for flt in ig.findall(_ns_tag(ns, "Filter")):
+            for flt in ig.findall(filter_tag):
                 if flt.get("Include") == "Source Files":
                     return
         ig = ET.SubElement(root, _ns_tag(ns, "ItemGroup"))
         flt = ET.SubElement(ig, _ns_tag(ns, "Filter"), {"Include": "Source Files"})
         uid = ET.SubElement(flt, _ns_tag(ns, "UniqueIdentifier"))
-        uid.text = "{" + str(uuid.uuid4()).upper() + "}"
+        # Deterministic, so regenerating an unchanged project rewrites nothing
+        uid.text = "{" + generate_project_guid("filter", "Source Files") + "}"
 
     ensure_source_filter()
 
     # Add new sources if any
     if sources:
         ig = ET.SubElement(root, _ns_tag(ns, "ItemGroup"))
+        cl_compile = _ns_tag(ns, "ClCompile")
+        filter_tag = _ns_tag(ns, "Filter")
+        items = []
         for s in sources:
-            cc = ET.SubElement(ig, _ns_tag(ns, "ClCompile"), {"Include": _backslash(s)})
-            flt = ET.SubElement(cc, _ns_tag(ns, "Filter"))
+            cc = ET.Element(cl_compile, {"Include": _backslash(s)})
+            flt = ET.SubElement(cc, filter_tag)
             flt.text = "Source Files"
-
-    return ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8")
+            items.append(cc)
+        ig.extend(items)
 
 
 def _make_relative(paths: List[str], to_dir: Path) -> List[str]:
@@ -406,13 +490,28 @@ def _make_relative(paths: List[str], to_dir: Path) -> List[str]:
     Returns:
         List of relative paths
     """
+    # os.path.relpath() per path, with the start directory absolutized,
+    # split and case-normalized once instead of once per path
+    start = os.path.abspath(to_dir)
+    start_drive, start_rest = os.path.splitdrive(start)
+    start_drive = os.path.normcase(start_drive)
+    start_parts = [os.path.normcase(x) for x in start_rest.split(os.sep) if x]
+    normcase = os.path.normcase
     out: List[str] = []
     for p in paths:
-        try:
-            out.append(os.path.relpath(p, start=to_dir))
-        except ValueError:
+        drive, rest = os.path.splitdrive(os.path.abspath(p))
+        if normcase(drive) != start_drive:
             # Different drive on Windows
             out.append(p)
+            continue
+        parts = [x for x in rest.split(os.sep) if x]
+        common = 0
+        for start_part, part in zip(start_parts, parts):
+            if start_part != normcase(part):
+                break
+            common += 1
+        rel = [os.pardir] * (len(start_parts) - common) + parts[common:]
+        out.append(os.path.join(*rel) if rel else os.curdir)
     return out
 
 
@@ -430,6 +529,99 @@ def _resolve_from_source_root(source_root: Path, rel_sources: List[str]) -> List
     return [str((source_root / s).resolve()) for s in rel_sources]
 
 
+def _xml_text(text: str) -> str:
+    """Escape element text as ElementTree serializes it."""
+    return xml.sax.saxutils.escape(text)
+
+
+def _xml_attr(value: str) -> str:
+    """Escape a double-quoted attribute value as ElementTree serializes it."""
+    return xml.sax.saxutils.escape(value, _XML_ATTR_ENTITIES)
+
+
+def _xml_text_element(tag: str, attrs: str, text: str) -> str:
+    """Serialize a text-only element; attrs is preformatted (with a leading space)."""
+    if not text:
+        return f"<{tag}{attrs} />"
+    return f"<{tag}{attrs}>{_xml_text(text)}</{tag}>"
+
+
+def _utility_condition(config: str) -> str:
+    """Condition attribute (with a leading space) selecting one x64 configuration."""
+    return f" Condition=\"'$(Configuration)|$(Platform)'=='{config}|x64'\""
+
+
+# Utility project files, matching what the ElementTree tree they replaced
+# serialized to (including the root's xmlns attribute written twice).
+# The per-configuration parts are filled in for each configuration and joined.
+_UTILITY_PROJECT_CONFIGURATION = (
+    '<ProjectConfiguration Include="{config}|x64"><Configuration>{config}</Configuration>'
+    '<Platform>x64</Platform></ProjectConfiguration>'
+)
+_UTILITY_CONFIG_PROPERTY_GROUP = (
+    '<PropertyGroup{condition} Label="Configuration">'
+    '<ConfigurationType>Utility</ConfigurationType><CharacterSet>MultiByte</CharacterSet>'
+    '<PlatformToolset>v143</PlatformToolset></PropertyGroup>'
+)
+_UTILITY_INT_DIR = (
+    '<IntDir{condition}>'
+    '$(Platform)\\$(Configuration)\\$(ProjectName)\\</IntDir>'
+)
+_UTILITY_MIDL_GROUP = (
+    '<ItemDefinitionGroup{condition}><Midl>'
+    '<OutputDirectory>$(ProjectDir)/$(IntDir)</OutputDirectory>'
+    '<HeaderFileName>%(Filename).h</HeaderFileName>'
+    '<TypeLibraryName>%(Filename).tlb</TypeLibraryName>'
+    '<InterfaceIdentifierFileName>%(Filename)_i.c</InterfaceIdentifierFileName>'
+    '<ProxyFileName>%(Filename)_p.c</ProxyFileName>'
+    '</Midl></ItemDefinitionGroup>'
+)
+_UTILITY_BUILD_IN_PARALLEL = (
+    '<BuildInParallel{condition}>true</BuildInParallel>'
+)
+_UTILITY_LINK_OBJECTS = (
+    '<LinkObjects{condition}>false</LinkObjects>'
+)
+_UTILITY_VCXPROJ_TEMPLATE = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    '<Project xmlns="{ns}" DefaultTargets="Build" ToolsVersion="17.0" xmlns="{ns}">'
+    '<PropertyGroup><PreferredToolArchitecture>x64</PreferredToolArchitecture></PropertyGroup>'
+    '<PropertyGroup><ResolveNugetPackages>false</ResolveNugetPackages></PropertyGroup>'
+    '<ItemGroup Label="ProjectConfigurations">{project_configurations}</ItemGroup>'
+    '<PropertyGroup Label="Globals"><ProjectGuid>{{{project_guid}}}</ProjectGuid>'
+    '<Keyword>Win32Proj</Keyword>'
+    '<WindowsTargetPlatformVersion>10.0.22621.0</WindowsTargetPlatformVersion>'
+    '<Platform>x64</Platform>{project_name_element}'
+    '<VCProjectUpgraderObjectName>NoUpgrade</VCProjectUpgraderObjectName></PropertyGroup>'
+    '<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.Default.props" />'
+    '{config_groups}'
+    '<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.props" />'
+    '<ImportGroup Label="ExtensionSettings" />'
+    '<ImportGroup Label="PropertySheets">'
+    '<Import Project="$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props"'
+    ' Condition="exists(\'$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props\')"'
+    ' Label="LocalAppDataPlatform" /></ImportGroup>'
+    '<PropertyGroup Label="UserMacros" />'
+    '<PropertyGroup><_ProjectFileVersion>10.0.20506.1</_ProjectFileVersion>{int_dirs}</PropertyGroup>'
+    '{midl_groups}'
+    '<ItemGroup><CustomBuild Include="{rule}"><UseUtf8Encoding>Always</UseUtf8Encoding>'
+    '{custom_build_steps}</CustomBuild></ItemGroup>'
+    '<ItemGroup /><ItemGroup />'
+    '<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.targets" />'
+    '<ImportGroup Label="ExtensionTargets" />'
+    '</Project>'
+)
+_UTILITY_FILTERS_TEMPLATE = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    '<Project xmlns="{ns}" ToolsVersion="17.0" xmlns="{ns}">'
+    '<ItemGroup><CustomBuild Include="{rule}"><Filter>CMake Rules</Filter></CustomBuild></ItemGroup>'
+    '<ItemGroup><Filter Include="CMake Rules">'
+    '<UniqueIdentifier>{{76AC2980-1951-3AA2-B7EF-A79AB4F1C49E}}</UniqueIdentifier>'
+    '</Filter></ItemGroup>'
+    '</Project>'
+)
+
+
 def generate_utility_project(
     project_name: str,
     project_guid: str,
@@ -468,165 +660,113 @@ def generate_utility_project(
             Path('build/')
         )
     """
-    project_guid_with_braces = "{" + project_guid + "}"
-
-    # Configurations
     configurations = ["Debug", "Release", "MinSizeRel", "RelWithDebInfo"]
 
-    # Create XML namespace
-    ns = "http://schemas.microsoft.com/developer/msbuild/2003"
-    ET.register_namespace("", ns)
-
-    def ns_tag(tag: str) -> str:
-        return f"{{{ns}}}{tag}"
-
-    # Build the vcxproj file
-    root = ET.Element(ns_tag("Project"), {
-        "DefaultTargets": "Build",
-        "ToolsVersion": "17.0",
-        "xmlns": ns
-    })
-
-    # PreferredToolArchitecture
-    pg = ET.SubElement(root, ns_tag("PropertyGroup"))
-    ET.SubElement(pg, ns_tag("PreferredToolArchitecture")).text = "x64"
-
-    # ResolveNugetPackages
-    pg = ET.SubElement(root, ns_tag("PropertyGroup"))
-    ET.SubElement(pg, ns_tag("ResolveNugetPackages")).text = "false"
-
-    # ProjectConfigurations
-    ig = ET.SubElement(root, ns_tag("ItemGroup"), {"Label": "ProjectConfigurations"})
-    for config in configurations:
-        pc = ET.SubElement(ig, ns_tag("ProjectConfiguration"), {"Include": f"{config}|x64"})
-        ET.SubElement(pc, ns_tag("Configuration")).text = config
-        ET.SubElement(pc, ns_tag("Platform")).text = "x64"
-
-    # Globals
-    pg = ET.SubElement(root, ns_tag("PropertyGroup"), {"Label": "Globals"})
-    ET.SubElement(pg, ns_tag("ProjectGuid")).text = project_guid_with_braces
-    ET.SubElement(pg, ns_tag("Keyword")).text = "Win32Proj"
-    ET.SubElement(pg, ns_tag("WindowsTargetPlatformVersion")).text = "10.0.22621.0"
-    ET.SubElement(pg, ns_tag("Platform")).text = "x64"
-    ET.SubElement(pg, ns_tag("ProjectName")).text = project_name
-    ET.SubElement(pg, ns_tag("VCProjectUpgraderObjectName")).text = "NoUpgrade"
-
-    # Import Default props
-    ET.SubElement(root, ns_tag("Import"), {"Project": "$(VCTargetsPath)\\Microsoft.Cpp.Default.props"})
-
-    # Configuration PropertyGroups
-    for config in configurations:
-        pg = ET.SubElement(root, ns_tag("PropertyGroup"), {
-            "Condition": f"'$(Configuration)|$(Platform)'=='{config}|x64'",
-            "Label": "Configuration"
-        })
-        ET.SubElement(pg, ns_tag("ConfigurationType")).text = "Utility"
-        ET.SubElement(pg, ns_tag("CharacterSet")).text = "MultiByte"
-        ET.SubElement(pg, ns_tag("PlatformToolset")).text = "v143"
-
-    # Import Cpp props
-    ET.SubElement(root, ns_tag("Import"), {"Project": "$(VCTargetsPath)\\Microsoft.Cpp.props"})
-
-    # ExtensionSettings
-    ET.SubElement(root, ns_tag("ImportGroup"), {"Label": "ExtensionSettings"})
-
-    # PropertySheets
-    ig = ET.SubElement(root, ns_tag("ImportGroup"), {"Label": "PropertySheets"})
-    ET.SubElement(ig, ns_tag("Import"), {
-        "Project": "$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props",
-        "Condition": "exists('$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props')",
-        "Label": "LocalAppDataPlatform"
-    })
-
-    # UserMacros
-    ET.SubElement(root, ns_tag("PropertyGroup"), {"Label": "UserMacros"})
-
-    # IntDir PropertyGroup
-    pg = ET.SubElement(root, ns_tag("PropertyGroup"))
-    ET.SubElement(pg, ns_tag("_ProjectFileVersion")).text = "10.0.20506.1"
-    for config in configurations:
-        ET.SubElement(pg, ns_tag("IntDir"), {
-            "Condition": f"'$(Configuration)|$(Platform)'=='{config}|x64'"
-        }).text = f"$(Platform)\\$(Configuration)\\$(ProjectName)\\"
-
-    # ItemDefinitionGroups (for Midl)
-    for config in configurations:
-        idg = ET.SubElement(root, ns_tag("ItemDefinitionGroup"), {
-            "Condition": f"'$(Configuration)|$(Platform)'=='{config}|x64'"
-        })
-        midl = ET.SubElement(idg, ns_tag("Midl"))
-        # Note: AdditionalIncludeDirectories would need to be parameterized if needed
-        ET.SubElement(midl, ns_tag("OutputDirectory")).text = "$(ProjectDir)/$(IntDir)"
-        ET.SubElement(midl, ns_tag("HeaderFileName")).text = "%(Filename).h"
-        ET.SubElement(midl, ns_tag("TypeLibraryName")).text = "%(Filename).tlb"
-        ET.SubElement(midl, ns_tag("InterfaceIdentifierFileName")).text = "%(Filename)_i.c"
-        ET.SubElement(midl, ns_tag("ProxyFileName")).text = "%(Filename)_p.c"
-
-    # CustomBuild ItemGroup
-    ig = ET.SubElement(root, ns_tag("ItemGroup"))
-    cb = ET.SubElement(ig, ns_tag("CustomBuild"), {"Include": custom_build_rule_path})
-    ET.SubElement(cb, ns_tag("UseUtf8Encoding")).text = "Always"
-
-    # Add custom build properties for each configuration
-    for config in configurations:
-        condition = f"'$(Configuration)|$(Platform)'=='{config}|x64'"
-        ET.SubElement(cb, ns_tag("BuildInParallel"), {"Condition": condition}).text = "true"
-        ET.SubElement(cb, ns_tag("Message"), {"Condition": condition}).text = message
-        ET.SubElement(cb, ns_tag("Command"), {"Condition": condition}).text = command
-
-        # Join additional inputs with semicolons
-        inputs_str = ";".join(additional_inputs)
-        if inputs_str:
-            inputs_str += ";%(AdditionalInputs)"
-        else:
-            inputs_str = "%(AdditionalInputs)"
-        ET.SubElement(cb, ns_tag("AdditionalInputs"), {"Condition": condition}).text = inputs_str
-
-        ET.SubElement(cb, ns_tag("Outputs"), {"Condition": condition}).text = outputs
-        ET.SubElement(cb, ns_tag("LinkObjects"), {"Condition": condition}).text = "false"
-
-    # Empty ItemGroups (for consistency with CMake output)
-    ET.SubElement(root, ns_tag("ItemGroup"))
-    ET.SubElement(root, ns_tag("ItemGroup"))
-
-    # Import Cpp targets
-    ET.SubElement(root, ns_tag("Import"), {"Project": "$(VCTargetsPath)\\Microsoft.Cpp.targets"})
-
-    # ExtensionTargets
-    ET.SubElement(root, ns_tag("ImportGroup"), {"Label": "ExtensionTargets"})
+    # Join additional inputs with semicolons
+    inputs_str = ";".join(additional_inputs)
+    if inputs_str:
+        inputs_str += ";%(AdditionalInputs)"
+    else:
+        inputs_str = "%(AdditionalInputs)"
+
+    # Condition attribute of each configuration's elements
+    conditions = [_utility_condition(config) for config in configurations]
+    rule_attr = _xml_attr(custom_build_rule_path)
+
+    project_configurations = "".join(
+        _UTILITY_PROJECT_CONFIGURATION.format(config=config) for config in configurations)
+    config_groups = "".join(
+        _UTILITY_CONFIG_PROPERTY_GROUP.format(condition=condition) for condition in conditions)
+    int_dirs = "".join(_UTILITY_INT_DIR.format(condition=condition) for condition in conditions)
+    midl_groups = "".join(_UTILITY_MIDL_GROUP.format(condition=condition) for condition in conditions)
+    custom_build_steps = "".join(
+        "".join([
+            _UTILITY_BUILD_IN_PARALLEL.format(condition=condition),
+            _xml_text_element("Message", condition, message),
+            _xml_text_element("Command", condition, command),
+            _xml_text_element("AdditionalInputs", condition, inputs_str),
+            _xml_text_element("Outputs", condition, outputs),
+            _UTILITY_LINK_OBJECTS.format(condition=condition),
+        ])
+        for condition in conditions
+    )
 
     # Write vcxproj file
     output_dir.mkdir(parents=True, exist_ok=True)
     vcxproj_path = output_dir / f"{project_name}.vcxproj"
 
-    # Convert to string with proper formatting
-    xml_str = ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8")
+    xml_str = _UTILITY_VCXPROJ_TEMPLATE.format(
+        project_configurations=project_configurations,
+        project_guid=_xml_text(project_guid),
+        project_name_element=_xml_text_element("ProjectName", "", project_name),
+        config_groups=config_groups,
+        int_dirs=int_dirs,
+        midl_groups=midl_groups,
+        custom_build_steps=custom_build_steps,
+        ns=_MSBUILD_NS,
+        rule=rule_attr,
+    )
     # Add BOM
     xml_str = "\ufeff" + xml_str
-    vcxproj_path.write_text(xml_str, encoding="utf-8-sig")
-
-    # Build the .filters file
-    root_filters = ET.Element(ns_tag("Project"), {
-        "ToolsVersion": "17.0",
-        "xmlns": ns
-    })
-
-    # CustomBuild ItemGroup
-    ig = ET.SubElement(root_filters, ns_tag("ItemGroup"))
-    cb = ET.SubElement(ig, ns_tag("CustomBuild"), {"Include": custom_build_rule_path})
-    ET.SubElement(cb, ns_tag("Filter")).text = "CMake Rules"
-
-    # Filter ItemGroup
-    ig = ET.SubElement(root_filters, ns_tag("ItemGroup"))
-    flt = ET.SubElement(ig, ns_tag("Filter"), {"Include": "CMake Rules"})
-    ET.SubElement(flt, ns_tag("UniqueIdentifier")).text = "{76AC2980-1951-3AA2-B7EF-A79AB4F1C49E}"
+    write_text_if_changed(vcxproj_path, xml_str, "utf-8-sig", force=True)
 
     # Write filters file
     filters_path = output_dir / f"{project_name}.vcxproj.filters"
-    xml_str = ET.tostring(root_filters, encoding="utf-8", xml_declaration=True).decode("utf-8")
+    xml_str = _UTILITY_FILTERS_TEMPLATE.format(ns=_MSBUILD_NS, rule=rule_attr)
     # Add BOM
     xml_str = "\ufeff" + xml_str
-    filters_path.write_text(xml_str, encoding="utf-8-sig")
+    write_text_if_changed(filters_path, xml_str, "utf-8-sig", force=True)
+
+
+def read_template_bytes(template_path: Path, template_name: str) -> Tuple[bytes, Optional[bytes]]:
+    """
+    Read a project template's .vcxproj and (if present) .vcxproj.filters files.
+
+    Returns:
+        Tuple of (vcxproj bytes, filters bytes or None)
+    """
+    template_vcxproj = template_path / f"{template_name}.vcxproj"
+    template_filters = template_path / f"{template_name}.vcxproj.filters"
+
+    vcx_bytes = template_vcxproj.read_bytes()
+    try:
+        filt_bytes: Optional[bytes] = template_filters.read_bytes()
+    except FileNotFoundError:
+        filt_bytes = None
+    return vcx_bytes, filt_bytes
+
+
+def _decode_template(data: bytes) -> str:
+    """Decode template bytes with universal newlines, matching Path.read_text()."""
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _read_template_text(template_path: Path, template_name: str) -> Tuple[str, Optional[str]]:
+    """
+    Decoded (vcxproj, filters or None) template text, read from disk only when
+    either file has changed since the last call for this template.
+    """
+    stamps = []
+    for suffix in (".vcxproj", ".vcxproj.filters"):
+        try:
+            st = os.stat(template_path / f"{template_name}{suffix}")
+            stamps.append((st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            stamps.append(None)
+    return _read_template_text_cached(str(template_path), template_name, tuple(stamps))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_template_text_cached(template_path: str, template_name: str, stamps) -> Tuple[str, Optional[str]]:
+    """_read_template_text() body; stamps (the files' size and mtime) are only part of the key."""
+    vcx_bytes, filt_bytes = read_template_bytes(Path(template_path), template_name)
+    filt_text = None
+    if filt_bytes is not None:
+        filt_text = _decode_template(filt_bytes)
+    return _decode_template(vcx_bytes), filt_text
 
 
 def generate_project_from_template(
@@ -635,7 +775,9 @@ def generate_project_from_template(
     project_name: str,
     project_guid: str,
     source_root: Path, sources_rel_to_root: List[str],
-    output_path: Path
+    output_path: Path,
+    template_bytes: Optional[Tuple[bytes, Optional[bytes]]] = None,
+    force: bool = False
 ) -> None:
     """
     Generate a project file from a template by replacing placeholders.
@@ -648,6 +790,12 @@ def generate_project_from_template(
         source_root: Path to the root directory containing source files
         sources_rel_to_root: List of source file paths relative to source_root to include in the project
         output_path: Path where the generated project should be written
+        template_bytes: Optional preloaded (vcxproj, filters) template contents,
+            filters being None if there is no filters template. Lets callers
+            generating many projects of one type in other processes read the
+            templates only once. Without it, templates are read through an
+            in-process cache that re-reads a file only when it changes.
+        force: If True, write the output files even if their content is unchanged
 
     Example:
         generate_project_from_template(
@@ -663,43 +811,100 @@ def generate_project_from_template(
             Path('build_dir/')
         )
     """
-    # Locate template files
-    template_vcxproj = template_path / f"{template_name}.vcxproj"
-    template_filters = template_path / f"{template_name}.vcxproj.filters"
-
-    # Read template files
-    vcx_text = template_vcxproj.read_text(encoding="utf-8", errors="replace")
-    filt_text = None
-    if template_filters.exists():
-        filt_text = template_filters.read_text(encoding="utf-8", errors="replace")
+    if template_bytes is None:
+        vcx_text, filt_text = _read_template_text(template_path, template_name)
+    else:
+        # Decode as read_text() would
+        vcx_text = _decode_template(template_bytes[0])
+        filt_text = None
+        if template_bytes[1] is not None:
+            filt_text = _decode_template(template_bytes[1])
 
     # Replace template name with project name everywhere (simple string replacement)
     vcx_text = vcx_text.replace(template_name, project_name)
     if filt_text is not None:
         filt_text = filt_text.replace(template_name, project_name)
 
-    # Remove CMake-generated CustomBuild elements
-    vcx_text = _remove_custom_build_in_vcxproj(vcx_text)
-
-    # Replace GUID using XML manipulation
-    vcx_text = _replace_guid_in_vcxproj(vcx_text, project_guid)
-
     # Resolve sources: (sources relative to source_root) → absolute → relative to output_path
     abs_sources = _resolve_from_source_root(source_root, sources_rel_to_root)
     rel_sources_for_proj = _make_relative(abs_sources, output_path)
 
-    # Replace sources in vcxproj and filters using XML manipulation
-    vcx_text = _replace_sources_in_vcxproj(vcx_text, rel_sources_for_proj)
+    # Edit the vcxproj with one parse and one serialization: remove
+    # CMake-generated CustomBuild elements, then replace GUID and sources
+    vcx_root, ns = _parse_project_xml(vcx_text)
+    _remove_custom_build(vcx_root, ns)
+    _replace_guid(vcx_root, ns, project_guid)
+    if not vcx_root.tag.startswith("{"):
+        # Template without a namespace: the GUID element was added in the
+        # MSBuild namespace, and serializing declares it as the default, so
+        # every element is in it when the sources are replaced
+        vcx_root, ns = _parse_project_xml(_serialize_project_xml(vcx_root))
+    _replace_sources(vcx_root, ns, rel_sources_for_proj)
+    # Serialized UTF-8 is exactly what gets written, so it stays bytes
+    vcx_bytes = _serialize_project_xml_bytes(vcx_root)
+
+    # Replace sources in filters using XML manipulation
+    filt_bytes = None
     if filt_text is not None:
-        filt_text = _replace_sources_in_filters(filt_text, rel_sources_for_proj)
+        filt_root, filt_ns = _parse_project_xml(filt_text)
+        _replace_filter_sources(filt_root, filt_ns, rel_sources_for_proj)
+        filt_bytes = _serialize_project_xml_bytes(filt_root)
 
     # Create output directory if needed
     output_path.mkdir(parents=True, exist_ok=True)
 
     # Write output files
     new_vcx = output_path / f"{project_name}.vcxproj"
-    new_vcx.write_text(vcx_text, encoding="utf-8")
+    write_bytes_if_changed(new_vcx, vcx_bytes, force)
 
-    if filt_text is not None:
+    if filt_bytes is not None:
         new_filters = output_path / f"{project_name}.vcxproj.filters"
-        new_filters.write_text(filt_text, encoding="utf-8")
+        write_bytes_if_changed(new_filters, filt_bytes, force)
+
+
+def _generate_project_job(job: Dict[str, Any]) -> None:
+    """Generate one project's files; module level so worker processes can run it."""
+    generate_project_from_template(**job)
+
+
+def generate_projects_from_template(jobs: List[Dict[str, Any]]) -> None:
+    """
+    Generate many projects, each job holding generate_project_from_template() arguments.
+
+    Template rendering is CPU-bound XML work, so large batches are spread
+    over worker processes. Small batches, and platforms where a process pool
+    cannot be started, are rendered in this process. Jobs without
+    template_bytes get them filled in, each template being read once.
+    """
+    # Read each template once, not once per project
+    templates: Dict[Tuple[str, str], Tuple[bytes, Optional[bytes]]] = {}
+    for job in jobs:
+        if job.get("template_bytes") is None:
+            key = (str(job["template_path"]), job["template_name"])
+            if key not in templates:
+                templates[key] = read_template_bytes(job["template_path"], job["template_name"])
+            job["template_bytes"] = templates[key]
+
+    cpu_count = os.cpu_count() or 1
+    if len(jobs) >= _PROCESS_POOL_MIN_JOBS and cpu_count > 1:
+        workers = min(cpu_count, len(jobs))
+        # Longest jobs first (by source count), so one big project does not
+        # start last and leave the other workers idle; jobs only write files,
+        # so their order does not affect the output
+        ordered = sorted(jobs, key=lambda job: len(job["sources_rel_to_root"]), reverse=True)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        except OSError:
+            # No process pool on this platform; render in-process below
+            pass
+        else:
+            with executor:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                for _ in executor.map(_generate_project_job, ordered, chunksize=chunksize):
+                    pass
+            return
+
+    for job in jobs:
+        _generate_project_job(job)